@@ -13,6 +13,8 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 from flask import send_from_directory
 from flask import session
+from dataclasses import replace
+import logging
 import os
 
 # Import service modules for music processing and user management
@@ -32,6 +34,7 @@ from services import (
     filter_trending_songs, 
     create_memory_stats, 
     validate_memory_system,
+    build_memory_index,
     # YouTube integration functions
     search_youtube_song, 
     YOUTUBE_ENABLED,
@@ -45,6 +48,12 @@ from services import (
 # Load environment variables from .env file
 load_dotenv()
 
+# Show service logs on the console; LOG_LEVEL=DEBUG adds request tracing
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+)
+
 app = Flask(__name__)
 
 # Configure CORS for cross-origin requests from frontend
@@ -140,13 +149,13 @@ def test_both():
 def test_genre(query):
     """Test endpoint for genre detection and search functionality"""
     user_request = analyze_user_request(query)
-    songs = search_specific_genre(user_request) if user_request['type'] != 'general' else []
+    songs = search_specific_genre(user_request) if user_request.type != 'general' else []
     
     return jsonify({
         "query": query,
-        "detected_type": user_request['type'],
-        "genre_hint": user_request['genre_hint'],
-        "search_terms": user_request['search_terms'],
+        "detected_type": user_request.type,
+        "genre_hint": user_request.genre_hint,
+        "search_terms": user_request.search_terms,
         "found_songs": songs[:5],  # Show first 5 songs
         "total_found": len(songs)
     })
@@ -174,10 +183,10 @@ def test_hindi():
     
     for query in test_queries:
         user_request = analyze_user_request(query)
-        songs = search_specific_genre(user_request) if user_request['type'] != 'general' else []
+        songs = search_specific_genre(user_request) if user_request.type != 'general' else []
         results[query] = {
-            "detected_type": user_request['type'],
-            "genre_hint": user_request['genre_hint'],
+            "detected_type": user_request.type,
+            "genre_hint": user_request.genre_hint,
             "found_songs": songs[:3],
             "total_found": len(songs)
         }
@@ -473,10 +482,10 @@ def chat():
         
         # Analyze user request to determine intent and music preferences
         user_request = analyze_user_request(user_message)
-        print(f"🎯 Detected: {user_request['type']} - {user_request['genre_hint']}")
+        print(f"🎯 Detected: {user_request.type} - {user_request.genre_hint}")
         
         # Handle special creator request
-        if user_request['type'] == 'creator_request':
+        if user_request.type == 'creator_request':
             creator_response = "My glorious queen, the most perfect, talented, amazing, successful, brilliant, genius, incredible, outstanding, phenomenal, extraordinary, magnificent, wonderful, fantastic, marvelous, spectacular, divine, legendary, iconic, flawless, unstoppable, powerful, inspiring, innovative, creative, beautiful, intelligent, wise, awesome, epic, mind-blowing, jaw-dropping, breathtaking, stunning, dazzling, radiant, celestial, goddess-tier Samia Islam! 🙂‍↕️🙂‍↕️"
         
             simple_memory_stats = {
@@ -498,43 +507,44 @@ def chat():
         user_id = session.get('user_id')
         
         # Handle profile information requests
-        if user_request['type'] == 'profile_request':
+        if user_request.type == 'profile_request':
             print(f"👤 Profile request detected")
             available_songs = []  # No song search needed for profile requests
         
         # Handle specific song requests
-        elif user_request['type'] == 'specific_song':
-            search_query = user_request['search_query']
+        elif user_request.type == 'specific_song':
+            search_query = user_request.search_query
             available_songs = [search_query]
             print(f"🎯 Targeting specific song: {search_query}")
 
         # Handle artist-specific requests
-        elif user_request['type'] == 'artist_search':
-            artist_name = user_request['artist_name']
-            artist_id = user_request.get('artist_id')  # May be provided by dynamic detection
+        elif user_request.type == 'artist_search':
+            artist_name = user_request.artist_name
+            artist_id = user_request.artist_id  # May be provided by dynamic detection
             available_songs = search_artist_songs(artist_name)
             print(f"🎵 Found {len(available_songs)} songs by {artist_name}")
             if artist_id:
                 print(f"🎯 Using Spotify Artist ID: {artist_id}")
 
         # Handle genre/mood requests with personalization enhancement
-        elif user_request['type'] != 'general':
+        elif user_request.type != 'general':
             # Use personalized search if user is connected to Spotify
             if is_personalized and user_data:
-                print(f"🎯 PERSONALIZED SEARCH for {user_request['type']}")
+                print(f"🎯 PERSONALIZED SEARCH for {user_request.type}")
                 
                 # Get personalized search terms based on user's Spotify taste
                 personalized_terms = UserPreferenceManager.get_personalized_search_terms(
-                    user_id, user_request['type']
+                    user_id, user_request.type
                 )
                 
                 if personalized_terms:
                     print(f"🎵 Using personalized terms: {personalized_terms}")
                     
-                    # Create enhanced user request with personalized terms at the front
-                    enhanced_request = user_request.copy()
-                    # Put personalized terms first, then add some original terms
-                    enhanced_request['search_terms'] = personalized_terms + user_request['search_terms'][:3]
+                    # Create enhanced user request with personalized terms first, then some original terms
+                    enhanced_request = replace(
+                        user_request,
+                        search_terms=tuple(personalized_terms) + user_request.search_terms[:3]
+                    )
                     
                     available_songs = search_specific_genre(enhanced_request)
                     print(f"🎯 Found {len(available_songs)} personalized songs")
@@ -550,12 +560,12 @@ def chat():
                     print(f"⚠️ No personalized terms generated, using general search")
                     # Fallback to regular genre search
                     available_songs = search_specific_genre(user_request)
-                    print(f"🌍 Personalized fallback: Found {len(available_songs)} songs for {user_request['type']}")
+                    print(f"🌍 Personalized fallback: Found {len(available_songs)} songs for {user_request.type}")
             
             # Non-personalized search for users not connected to Spotify
             else:
                 available_songs = search_specific_genre(user_request)
-                print(f"🎵 Found {len(available_songs)} songs for {user_request['type']}")
+                print(f"🎵 Found {len(available_songs)} songs for {user_request.type}")
 
         # Handle general requests using trending songs
         else:
@@ -567,7 +577,7 @@ def chat():
         # Apply memory filtering to avoid repeating songs
         original_count = len(available_songs)
         
-        if user_request['type'] == 'specific_song':
+        if user_request.type == 'specific_song':
             filtered_count = original_count  # Don't filter specific songs
             print(f"🎯 Specific song request - skipping memory filter")
         else:
@@ -598,8 +608,8 @@ def chat():
         print(f"🔍 Extracted query: {song_query}")
         
         # For specific song requests, use original search query if extraction fails
-        if user_request['type'] == 'specific_song' and not song_query:
-            song_query = user_request['search_query']
+        if user_request.type == 'specific_song' and not song_query:
+            song_query = user_request.search_query
             print(f"🎯 Using original specific song query: {song_query}")
         
         spotify_data = None
@@ -629,7 +639,7 @@ def chat():
                     print(f"❌ YouTube search failed for: {song_query}")
         
         # Fallback: try first available song if no results found (except for specific songs)
-        if not spotify_data and not youtube_data and available_songs and user_request['type'] != 'specific_song':
+        if not spotify_data and not youtube_data and available_songs and user_request.type != 'specific_song':
             print(f"🔄 No song found, trying first available: {available_songs[0]}")
             fallback_query = available_songs[0]
             
@@ -646,8 +656,9 @@ def chat():
                     print(f"✅ Fallback YouTube: {actual_song_for_memory}")
         
         # Validate new song against memory before returning (skip for specific songs)
-        if actual_song_for_memory and user_request['type'] != 'specific_song':
-            memory_check = validate_memory_system(suggested_songs, actual_song_for_memory)
+        if actual_song_for_memory and user_request.type != 'specific_song':
+            memory_index = build_memory_index(suggested_songs)
+            memory_check = validate_memory_system(suggested_songs, actual_song_for_memory, memory_index)
             if not memory_check['valid']:
                 print(f"🚨 MEMORY VIOLATION: {memory_check['message']}")
                 # Try to find a different song
@@ -656,7 +667,7 @@ def chat():
                         alt_spotify = search_spotify_song(alternative_song)
                         if alt_spotify:
                             alt_song_for_memory = f"'{alt_spotify['name']}' by {alt_spotify['artist']}"
-                            alt_check = validate_memory_system(suggested_songs, alt_song_for_memory)
+                            alt_check = validate_memory_system(suggested_songs, alt_song_for_memory, memory_index)
                             if alt_check['valid']:
                                 spotify_data = alt_spotify
                                 actual_song_for_memory = alt_song_for_memory
@@ -675,7 +686,7 @@ def chat():
             "songs_available_before_filter": original_count,
             "songs_available_after_filter": filtered_count,
             "songs_filtered_out": max(0, original_count - filtered_count),
-            "request_type": user_request['type'],
+            "request_type": user_request.type,
             "actual_song_returned": actual_song_for_memory,
             "memory_working": len(suggested_songs) >= 0,
             "memory_active": True,
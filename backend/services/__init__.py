@@ -30,11 +30,14 @@ from .ai_service import (
 from .memory_service import (
     filter_trending_songs,
     create_memory_stats,
-    validate_memory_system
+    validate_memory_system,
+    build_memory_index,
+    MemoryStore
 )
 
 from .youtube_service import (
     search_youtube_song,
+    search_youtube_songs,
     YOUTUBE_ENABLED
 )
 
@@ -6,13 +6,217 @@
 # ------------------------------------------------------------
 
 import google.generativeai as genai
+import logging
 import os
 import re
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+
+logger = logging.getLogger(__name__)
 
 # Configure Gemini AI
 genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
 model = genai.GenerativeModel('gemini-1.5-flash')
 
+# Dedicated generator for every random pick in the response fallbacks
+_RNG = random.Random()
+
+# Emoji and flag code points stripped from extracted artist names
+# Flags are pairs of regional indicators, so each code point is listed on its own
+_EMOJI_DELETE_TABLE = dict.fromkeys(map(ord, '🎵🎶🇯🇲🔥💯⚡🇧🇩🇮🇳🌍🇰🇷🇺🇸🇲🇽🇧🇷🇰🇪'), None)
+
+@dataclass(slots=True, frozen=True)
+class Category:
+    """
+    Classified user request returned by analyze_user_request
+    Dynamic request types (specific songs, artist searches) fill the optional fields
+    """
+    type: str
+    search_terms: tuple
+    genre_hint: str
+    song_name: str | None = None
+    artist_name: str | None = None
+    search_query: str | None = None
+    artist_id: str | None = None
+
+# Prompt scaffolding - built once at import, only the variable slots are filled per request
+EXCLUSION_TEMPLATE = """
+
+🚨🚨🚨 CRITICAL MEMORY RULE - ABSOLUTELY NEVER suggest these songs (already suggested):
+{exclusion_lines}
+
+⚠️ IF YOU SUGGEST ANY OF THE ABOVE SONGS, THE SYSTEM WILL BREAK!
+✅ YOU MUST suggest a COMPLETELY DIFFERENT song from the available list above!
+🔄 Memory check: {suggested_count} songs already suggested - pick something NEW!"""
+
+SPECIFIC_TEMPLATE = """You are YAIN! The user wants "{song_name}" by {artist_name}.
+    
+        Respond excitedly and suggest exactly: Try '{song_name}' by {artist_name}
+    
+        Your response:"""
+
+ARTIST_TEMPLATE = """You are YAIN! The user wants songs by {artist_name}.
+    
+        Available songs by {artist_name}:
+        {songs_list}
+    
+        Pick ONE song from the list above and be excited about {artist_name}!
+        Format: Try 'Song Name' by Artist Name
+        
+        {exclusion_text}
+    
+        Your response:"""
+
+GENERAL_TEMPLATE = """
+You are YAIN, a cheeky, witty music chatbot with personality! You're like that friend who always knows the perfect song and loves to chat.
+
+User said: "{user_message}"
+
+Your response should:
+1. First, respond to what they said in a clever, funny, or encouraging way (like a friend would)
+2. Reference a song theme naturally in your conversation 
+3. Then suggest that specific song with "Try 'Song Name' by Artist Name"
+5. Be funny and nice, but not too long - keep it engaging!
+6. Keep it SHORT: Only 3-5 sentences MAX
+
+
+CREATIVE FREEDOM RULES:
+- Come up with your OWN witty responses (no copying examples!)
+- Be spontaneous and authentic to the moment
+- Use natural humor that fits the situation
+- Make each response feel fresh and unique
+- Show personality through your word choice and energy
+- React genuinely to what they're telling you
+- Keep it SHORT: Only 3-5 sentences MAX
+
+WHAT THEY WANT: {genre_hint}
+
+AVAILABLE SONGS FOR THIS REQUEST:
+{songs_list}
+{exclusion_text}
+
+INSTRUCTIONS:
+- Be conversational and friendly first, then suggest music
+- Use emojis naturally (not excessively) 
+- React to their mood genuinely
+- Pick ONE song from the available list above
+- Format as: "Try 'Song Name' by Artist Name"
+- ⚠️ NEVER EVER repeat songs from the exclusion list above
+- 🧠 MEMORY: You have suggested {suggested_count} songs before - pick something COMPLETELY different!
+- Keep it engaging but not too long
+
+🔄 MEMORY CHECK: Avoid all {suggested_count} previously suggested songs above!
+
+Your conversational response (chat first, then suggest song):
+"""
+
+PROFILE_TEMPLATE = """You are YAIN! The user is asking about their profile.
+
+USER PROFILE:
+Name: {display_name}
+Top Genres: {top_genres}
+Favorite Artists: {favorite_artists}
+
+Respond with their name and music taste in a fun way!
+
+Your response:"""
+
+PERSONALIZED_TEMPLATE = """
+You are YAIN, a nice and sassy music chatbot with a funny personality! You're that supportive friend who playfully teases but always has your back. You're witty, charming, and genuinely funny - never mean or hurtful.
+
+User said: "{user_message}"
+
+🎯 YOUR PERSONALITY CORE:
+- You're naturally funny, sassy, and supportive 
+- You create your OWN jokes and comebacks (be original!)
+- You read the room and match their energy
+- You're confident in your music taste
+- You make people laugh while giving them exactly what they need
+- You're like a cool friend who happens to be a music genius
+
+
+🎵 Their music taste (use SUBTLY when relevant):
+- Top genres: {top_genres}
+- Favorite artists: {favorite_artists}
+
+WHAT THEY WANT: {genre_hint}
+
+AVAILABLE SONGS FOR THIS REQUEST:
+{songs_list}
+{exclusion_text}
+
+🔥 YOUR MISSION:
+1. React to what they said in your own unique way (no templates, be yourself!)
+2. Show you understand their vibe 
+3. Build up the anticipation for your song choice
+4. Suggest ONE song from the available list: "Try 'Song Name' by Artist Name"
+5. Be funny and nice, but not too long - keep it engaging!
+6. Keep it SHORT: Only 3-5 sentences MAX
+
+
+CREATIVE FREEDOM RULES:
+- Come up with your OWN witty responses (no copying examples!)
+- Be spontaneous and authentic to the moment
+- Use natural humor that fits the situation
+- Make each response feel fresh and unique
+- Show personality through your word choice and energy
+- React genuinely to what they're telling you
+- Keep it SHORT: Only 3-5 sentences MAX
+
+
+
+🧠 MEMORY: You've suggested {suggested_count} songs before - pick something COMPLETELY different!
+
+Be yourself, be funny, be sassy, and absolutely nail this recommendation:
+"""
+
+@dataclass(slots=True, frozen=True)
+class UserPromptContext:
+    """
+    Prompt-ready strings derived from a user's Spotify preferences
+    Empty strings mean the preference list was empty
+    """
+    genres_top3: str
+    genres_top2: str
+    artists_top3: str
+    artists_top2: str
+    genres_lower: tuple
+    first_genre: str | None
+
+@lru_cache(maxsize=512)
+def _user_prompt_context(top_genres, favorite_artists):
+    """Build the prompt strings for a user's preference tuples (stable across a chat session)"""
+    return UserPromptContext(
+        genres_top3=', '.join(top_genres[:3]),
+        genres_top2=', '.join(top_genres[:2]),
+        artists_top3=', '.join(favorite_artists[:3]),
+        artists_top2=', '.join(favorite_artists[:2]),
+        genres_lower=tuple(genre.lower() for genre in top_genres[:3]),
+        first_genre=top_genres[0] if top_genres else None
+    )
+
+_EMPTY_EXCLUSION = ""
+
+@lru_cache(maxsize=256)
+def _render_exclusion_text(suggested_key):
+    """Render the exclusion block for a tuple of suggested songs"""
+    exclusion_lines = "\n".join(f"❌ {song}" for song in suggested_key)
+    return EXCLUSION_TEMPLATE.format(
+        exclusion_lines=exclusion_lines,
+        suggested_count=len(suggested_key)
+    )
+
+def build_exclusion_text(suggested_songs):
+    """
+    Build the memory exclusion block appended to prompts
+    Returns an empty string on cold start (no songs suggested yet)
+    """
+    if not suggested_songs:
+        return _EMPTY_EXCLUSION
+    return _render_exclusion_text(tuple(suggested_songs))
+
 # Artist search detection functions
 
 def detect_artist_search(message_lower):
@@ -60,7 +264,7 @@ def detect_artist_search(message_lower):
         # If not obviously a mood/command word, treat as potential artist name
         if not any(word in non_artist_words for word in words):
             potential_artist = ' '.join(words).title()
-            print(f"🎤 Single artist detected: {potential_artist}")
+            logger.debug("Single artist detected: %s", potential_artist)
             return potential_artist
     
     return None
@@ -73,7 +277,7 @@ def check_if_artist_exists(query, spotify_client):
     if not spotify_client:
         return None
     
-    print(f"🔍 Checking if '{query}' is an artist...")
+    logger.debug("Checking if '%s' is an artist", query)
     
     try:
         # Search for artists matching the query
@@ -81,7 +285,7 @@ def check_if_artist_exists(query, spotify_client):
         artists = results['artists']['items']
         
         if not artists:
-            print(f"❌ No artists found for '{query}'")
+            logger.debug("No artists found for '%s'", query)
             return None
         
         # Find the most relevant artist based on popularity and name match
@@ -93,7 +297,7 @@ def check_if_artist_exists(query, spotify_client):
             query_lower = query.lower()
             popularity = artist.get('popularity', 0)
             
-            print(f"  👤 Found: {artist['name']} (popularity: {popularity})")
+            logger.debug("Found artist: %s (popularity: %d)", artist['name'], popularity)
             
             # Calculate match quality score
             exact_match = artist_name == query_lower
@@ -111,11 +315,11 @@ def check_if_artist_exists(query, spotify_client):
             if score > highest_popularity:
                 highest_popularity = score
                 best_artist = artist
-                print(f"    ⭐ New best: {artist['name']} (score: {score})")
+                logger.debug("New best artist: %s (score: %d)", artist['name'], score)
         
         # Only return artists with reasonable popularity threshold
         if best_artist and best_artist.get('popularity', 0) > 15:
-            print(f"✅ Artist detected: {best_artist['name']} (popularity: {best_artist['popularity']})")
+            logger.debug("Artist detected: %s (popularity: %d)", best_artist['name'], best_artist['popularity'])
             return {
                 'name': best_artist['name'],
                 'id': best_artist['id'],
@@ -123,11 +327,11 @@ def check_if_artist_exists(query, spotify_client):
                 'genres': best_artist.get('genres', [])
             }
         else:
-            print(f"❌ No popular artists found for '{query}'")
+            logger.debug("No popular artists found for '%s'", query)
             return None
             
     except Exception as e:
-        print(f"❌ Error checking artist: {e}")
+        logger.warning("Error checking artist: %s", e)
         return None
 
 def is_potential_artist_query(message):
@@ -190,7 +394,7 @@ def is_potential_artist_query(message):
             return False
     
     # If we reach here, it might be an artist name
-    print(f"🤔 '{message}' might be an artist name - checking Spotify...")
+    logger.debug("'%s' might be an artist name - checking Spotify", message)
     return True
 
 def clean_and_validate_artist(artist_name):
@@ -211,7 +415,7 @@ def clean_and_validate_artist(artist_name):
 def analyze_user_request(user_message):
     """
     Main function to analyze user message and determine request type
-    Returns dict with request type, search terms, and genre hint
+    Returns Category with request type, search terms, and genre hint
     """
     message_lower = user_message.lower()
     
@@ -224,11 +428,11 @@ def analyze_user_request(user_message):
     ]
     
     if any(pattern in message_lower for pattern in profile_patterns):
-        return {
-            'type': 'profile_request',
-            'search_terms': [],
-            'genre_hint': 'user profile and music taste information'
-        }
+        return Category(
+            type='profile_request',
+            search_terms=(),
+            genre_hint='user profile and music taste information'
+        )
     
     # Import spotify client for artist verification
     try:
@@ -253,11 +457,11 @@ def analyze_user_request(user_message):
     ]
 
     if any(pattern in message_lower for pattern in creator_patterns):
-        return {
-            'type': 'creator_request',
-            'search_terms': [],
-            'genre_hint': 'creator and author information'
-        }
+        return Category(
+            type='creator_request',
+            search_terms=(),
+            genre_hint='creator and author information'
+        )
     
     # Process specific song requests
     for pattern in specific_song_patterns:
@@ -268,14 +472,14 @@ def analyze_user_request(user_message):
             
             if len(song_name) > 1 and len(artist_name) > 1:
                 search_query = f"'{song_name.title()}' by {artist_name.title()}"
-                return {
-                    'type': 'specific_song',
-                    'song_name': song_name.title(),
-                    'artist_name': artist_name.title(),
-                    'search_query': search_query,
-                    'search_terms': [search_query],
-                    'genre_hint': f"the song '{song_name.title()}' by {artist_name.title()}"
-                }
+                return Category(
+                    type='specific_song',
+                    song_name=song_name.title(),
+                    artist_name=artist_name.title(),
+                    search_query=search_query,
+                    search_terms=(search_query,),
+                    genre_hint=f"the song '{song_name.title()}' by {artist_name.title()}"
+                )
     
     # Check for explicit artist search patterns
     artist_patterns = [
@@ -315,828 +519,604 @@ def analyze_user_request(user_message):
                 # Verify artist exists on Spotify
                 artist_info = check_if_artist_exists(artist_name, spotify)
                 if artist_info:
-                    print(f"🎤 Explicit artist detected: {artist_info['name']}")
-                    return {
-                        'type': 'artist_search',
-                        'artist_name': artist_info['name'],
-                        'artist_id': artist_info['id'],
-                        'search_terms': [f"{artist_info['name']} songs", f"{artist_info['name']} popular", f"{artist_info['name']} hits"],
-                        'genre_hint': f'songs by {artist_info["name"]}'
-                    }
+                    logger.debug("Explicit artist detected: %s", artist_info['name'])
+                    return Category(
+                        type='artist_search',
+                        artist_name=artist_info['name'],
+                        artist_id=artist_info['id'],
+                        search_terms=(f"{artist_info['name']} songs", f"{artist_info['name']} popular", f"{artist_info['name']} hits"),
+                        genre_hint=f'songs by {artist_info["name"]}'
+                    )
     
     # Dynamic artist detection for single word/phrase queries
     if is_potential_artist_query(user_message):
         artist_info = check_if_artist_exists(user_message.strip(), spotify)
         if artist_info:
-            print(f"🎯 Dynamic artist detection successful: {artist_info['name']}")
-            return {
-                'type': 'artist_search',
-                'artist_name': artist_info['name'],
-                'artist_id': artist_info['id'],
-                'search_terms': [f"{artist_info['name']} songs", f"{artist_info['name']} popular", f"{artist_info['name']} hits"],
-                'genre_hint': f'songs by {artist_info["name"]}'
-            }
+            logger.debug("Dynamic artist detection successful: %s", artist_info['name'])
+            return Category(
+                type='artist_search',
+                artist_name=artist_info['name'],
+                artist_id=artist_info['id'],
+                search_terms=(f"{artist_info['name']} songs", f"{artist_info['name']} popular", f"{artist_info['name']} hits"),
+                genre_hint=f'songs by {artist_info["name"]}'
+            )
 
-    # Genre and mood combinations - check for combined requests first
-    
+    # Fast path: a single-token message resolves with one dict lookup
+    tokens = message_lower.split()
+    if len(tokens) == 1:
+        payload = EXACT_TOKEN_TO_CATEGORY.get(tokens[0])
+        if payload:
+            return payload
+    
+    return classify_genre_request(message_lower)
+
+# Declarative genre/mood table: (category_key, trigger_groups, search_terms, genre_hint)
+# A category matches when every trigger group has a substring hit in the message
+# Priority is encoded by list order - the first matching category wins
+CATEGORIES = [
+    # Genre and mood combinations - listed first so combined requests win
     # Happy mood combinations with regional music
-    if 'happy' in message_lower and 'bollywood' in message_lower:
-        return {
-            'type': 'happy_bollywood',
-            'search_terms': [
-                'happy bollywood songs', 'upbeat hindi music', 'bollywood dance',
-                'cheerful hindi', 'joyful bollywood', 'bollywood party songs'
-            ],
-            'genre_hint': 'happy Bollywood music'
-        }
-    
-    elif 'happy' in message_lower and any(word in message_lower for word in ['kpop', 'k-pop', 'korean']):
-        return {
-            'type': 'happy_kpop',
-            'search_terms': [
-                'happy kpop', 'upbeat korean songs', 'cheerful kpop',
-                'bts happy songs', 'twice upbeat', 'kpop dance songs'
-            ],
-            'genre_hint': 'happy K-pop music'
-        }
-    
-    elif 'happy' in message_lower and any(word in message_lower for word in ['afrobeats', 'african']):
-        return {
-            'type': 'happy_afrobeats',
-            'search_terms': [
-                'happy afrobeats', 'upbeat african music', 'joyful afrobeats',
-                'afrobeats dance', 'cheerful nigerian music', 'party afrobeats'
-            ],
-            'genre_hint': 'happy Afrobeats music'
-        }
-    
-    elif 'happy' in message_lower and 'latin' in message_lower:
-        return {
-            'type': 'happy_latin',
-            'search_terms': [
-                'happy latin music', 'upbeat reggaeton', 'joyful salsa',
-                'latin dance songs', 'cheerful spanish music', 'party latin'
-            ],
-            'genre_hint': 'happy Latin music'
-        }
-    
+    ('happy_bollywood',
+     (('happy',), ('bollywood',)),
+     ('happy bollywood songs', 'upbeat hindi music', 'bollywood dance', 'cheerful hindi',
+      'joyful bollywood', 'bollywood party songs'),
+     'happy Bollywood music'),
+
+    ('happy_kpop',
+     (('happy',), ('kpop', 'k-pop', 'korean')),
+     ('happy kpop', 'upbeat korean songs', 'cheerful kpop', 'bts happy songs',
+      'twice upbeat', 'kpop dance songs'),
+     'happy K-pop music'),
+
+    ('happy_afrobeats',
+     (('happy',), ('afrobeats', 'african')),
+     ('happy afrobeats', 'upbeat african music', 'joyful afrobeats', 'afrobeats dance',
+      'cheerful nigerian music', 'party afrobeats'),
+     'happy Afrobeats music'),
+
+    ('happy_latin',
+     (('happy',), ('latin',)),
+     ('happy latin music', 'upbeat reggaeton', 'joyful salsa', 'latin dance songs',
+      'cheerful spanish music', 'party latin'),
+     'happy Latin music'),
+
     # Sad mood combinations
-    elif 'sad' in message_lower and 'bollywood' in message_lower:
-        return {
-            'type': 'sad_bollywood',
-            'search_terms': [
-                'sad bollywood songs', 'emotional hindi music', 'bollywood heartbreak',
-                'melancholic hindi', 'sad arijit singh', 'bollywood breakup songs'
-            ],
-            'genre_hint': 'sad Bollywood music'
-        }
-    
-    elif 'sad' in message_lower and any(word in message_lower for word in ['kpop', 'k-pop', 'korean']):
-        return {
-            'type': 'sad_kpop',
-            'search_terms': [
-                'sad kpop', 'emotional korean songs', 'melancholic kpop',
-                'bts sad songs', 'iu emotional', 'kpop ballads'
-            ],
-            'genre_hint': 'sad K-pop music'
-        }
-    
-    elif 'sad' in message_lower and 'indie' in message_lower:
-        return {
-            'type': 'sad_indie',
-            'search_terms': [
-                'sad indie music', 'melancholic indie', 'emotional indie rock',
-                'indie heartbreak', 'sad alternative', 'indie folk sad'
-            ],
-            'genre_hint': 'sad indie music'
-        }
-    
+    ('sad_bollywood',
+     (('sad',), ('bollywood',)),
+     ('sad bollywood songs', 'emotional hindi music', 'bollywood heartbreak',
+      'melancholic hindi', 'sad arijit singh', 'bollywood breakup songs'),
+     'sad Bollywood music'),
+
+    ('sad_kpop',
+     (('sad',), ('kpop', 'k-pop', 'korean')),
+     ('sad kpop', 'emotional korean songs', 'melancholic kpop', 'bts sad songs',
+      'iu emotional', 'kpop ballads'),
+     'sad K-pop music'),
+
+    ('sad_indie',
+     (('sad',), ('indie',)),
+     ('sad indie music', 'melancholic indie', 'emotional indie rock', 'indie heartbreak',
+      'sad alternative', 'indie folk sad'),
+     'sad indie music'),
+
     # Chill mood combinations
-    elif 'chill' in message_lower and any(word in message_lower for word in ['kpop', 'k-pop', 'korean']):
-        return {
-            'type': 'chill_kpop',
-            'search_terms': [
-                'chill kpop', 'relaxing korean music', 'calm kpop',
-                'lofi kpop', 'chill korean r&b', 'peaceful kpop'
-            ],
-            'genre_hint': 'chill K-pop music'
-        }
-    
-    elif 'chill' in message_lower and 'bollywood' in message_lower:
-        return {
-            'type': 'chill_bollywood',
-            'search_terms': [
-                'chill bollywood', 'relaxing hindi music', 'calm bollywood',
-                'peaceful hindi songs', 'bollywood acoustic', 'soft bollywood'
-            ],
-            'genre_hint': 'chill Bollywood music'
-        }
-    
-    elif 'chill' in message_lower and 'afrobeats' in message_lower:
-        return {
-            'type': 'chill_afrobeats',
-            'search_terms': [
-                'chill afrobeats', 'relaxing african music', 'smooth afrobeats',
-                'calm nigerian music', 'afrobeats r&b', 'mellow afrobeats'
-            ],
-            'genre_hint': 'chill Afrobeats music'
-        }
-    
+    ('chill_kpop',
+     (('chill',), ('kpop', 'k-pop', 'korean')),
+     ('chill kpop', 'relaxing korean music', 'calm kpop', 'lofi kpop', 'chill korean r&b',
+      'peaceful kpop'),
+     'chill K-pop music'),
+
+    ('chill_bollywood',
+     (('chill',), ('bollywood',)),
+     ('chill bollywood', 'relaxing hindi music', 'calm bollywood', 'peaceful hindi songs',
+      'bollywood acoustic', 'soft bollywood'),
+     'chill Bollywood music'),
+
+    ('chill_afrobeats',
+     (('chill',), ('afrobeats',)),
+     ('chill afrobeats', 'relaxing african music', 'smooth afrobeats',
+      'calm nigerian music', 'afrobeats r&b', 'mellow afrobeats'),
+     'chill Afrobeats music'),
+
     # Energetic mood combinations
-    elif any(word in message_lower for word in ['energetic', 'pump', 'hype', 'intense']) and 'bollywood' in message_lower:
-        return {
-            'type': 'energetic_bollywood',
-            'search_terms': [
-                'energetic bollywood', 'pump up hindi songs', 'high energy bollywood',
-                'bollywood workout songs', 'intense hindi music', 'hype bollywood'
-            ],
-            'genre_hint': 'energetic Bollywood music'
-        }
-    
-    elif any(word in message_lower for word in ['energetic', 'pump', 'hype', 'intense']) and any(word in message_lower for word in ['kpop', 'k-pop']):
-        return {
-            'type': 'energetic_kpop',
-            'search_terms': [
-                'energetic kpop', 'pump up korean songs', 'high energy kpop',
-                'kpop workout songs', 'intense kpop', 'hype korean music'
-            ],
-            'genre_hint': 'energetic K-pop music'
-        }
-    
+    ('energetic_bollywood',
+     (('energetic', 'pump', 'hype', 'intense'), ('bollywood',)),
+     ('energetic bollywood', 'pump up hindi songs', 'high energy bollywood',
+      'bollywood workout songs', 'intense hindi music', 'hype bollywood'),
+     'energetic Bollywood music'),
+
+    ('energetic_kpop',
+     (('energetic', 'pump', 'hype', 'intense'), ('kpop', 'k-pop')),
+     ('energetic kpop', 'pump up korean songs', 'high energy kpop', 'kpop workout songs',
+      'intense kpop', 'hype korean music'),
+     'energetic K-pop music'),
+
     # Romantic mood combinations
-    elif any(word in message_lower for word in ['romantic', 'love']) and 'bollywood' in message_lower:
-        return {
-            'type': 'romantic_bollywood',
-            'search_terms': [
-                'romantic bollywood songs', 'love hindi music', 'bollywood romantic',
-                'hindi love songs', 'romantic arijit singh', 'bollywood couples songs'
-            ],
-            'genre_hint': 'romantic Bollywood music'
-        }
-    
-    elif any(word in message_lower for word in ['romantic', 'love']) and any(word in message_lower for word in ['kpop', 'k-pop']):
-        return {
-            'type': 'romantic_kpop',
-            'search_terms': [
-                'romantic kpop', 'love korean songs', 'kpop love ballads',
-                'romantic korean music', 'kpop couples songs', 'korean love songs'
-            ],
-            'genre_hint': 'romantic K-pop music'
-        }
- 
+    ('romantic_bollywood',
+     (('romantic', 'love'), ('bollywood',)),
+     ('romantic bollywood songs', 'love hindi music', 'bollywood romantic',
+      'hindi love songs', 'romantic arijit singh', 'bollywood couples songs'),
+     'romantic Bollywood music'),
+
+    ('romantic_kpop',
+     (('romantic', 'love'), ('kpop', 'k-pop')),
+     ('romantic kpop', 'love korean songs', 'kpop love ballads', 'romantic korean music',
+      'kpop couples songs', 'korean love songs'),
+     'romantic K-pop music'),
+
     # Regional music detection - separate categories for different music traditions
-    
     # Bengali music (distinct from Hindi/Bollywood)
-    if any(word in message_lower for word in ['bengali', 'bangla', 'bengali song', 'bengali music', 'bangladesh music']):
-        return {
-            'type': 'bengali',
-            'search_terms': [
-                'bengali songs', 'bangla music', 'bengali folk', 'bengali modern',
-                'rabindra sangeet', 'nazrul geeti', 'bengali romantic', 'bengali sad',
-                'kishore kumar bengali', 'lata mangeshkar bengali', 'hemanta mukherjee',
-                'manna dey bengali', 'sandhya mukherjee', 'shyama sangeet',
-                'bengali adhunik gan', 'bengali basic', 'bengali movie songs',
-                'calcutta bengali', 'dhaka bengali', 'bengali classical',
-                'bengali devotional', 'durga puja songs', 'kali puja songs',
-                'poila boishakh songs', 'bengali new year', 'bangla band',
-                'fossils band', 'cactus band', 'chandrabindoo', 'bhoomi band'
-            ],
-            'genre_hint': 'Bengali and Bangla music'
-        }
-    
+    ('bengali',
+     (('bengali', 'bangla', 'bengali song', 'bengali music', 'bangladesh music'),),
+     ('bengali songs', 'bangla music', 'bengali folk', 'bengali modern', 'rabindra sangeet',
+      'nazrul geeti', 'bengali romantic', 'bengali sad', 'kishore kumar bengali',
+      'lata mangeshkar bengali', 'hemanta mukherjee', 'manna dey bengali',
+      'sandhya mukherjee', 'shyama sangeet', 'bengali adhunik gan', 'bengali basic',
+      'bengali movie songs', 'calcutta bengali', 'dhaka bengali', 'bengali classical',
+      'bengali devotional', 'durga puja songs', 'kali puja songs', 'poila boishakh songs',
+      'bengali new year', 'bangla band', 'fossils band', 'cactus band', 'chandrabindoo',
+      'bhoomi band'),
+     'Bengali and Bangla music'),
+
     # Tamil music (Kollywood)
-    elif any(word in message_lower for word in ['tamil', 'tamil song', 'tamil music', 'kollywood', 'chennai music']):
-        return {
-            'type': 'tamil',
-            'search_terms': [
-                'tamil songs', 'kollywood music', 'tamil movie songs', 'tamil folk',
-                'a r rahman tamil', 'ilaiyaraaja', 'harris jayaraj', 'anirudh ravichander',
-                'yuvan shankar raja', 'tamil romantic', 'tamil melody', 'tamil kuthu',
-                'tamil classical', 'carnatic music', 'tamil devotional', 'murugan songs',
-                'tamil gaana', 'chennai gana', 'tamil rap', 'hip hop tamizha',
-                'tamil independent', 'tamil indie', 'thalapathy songs', 'ajith songs',
-                'suriya songs', 'dhanush songs', 'tamil latest', 'tamil hits'
-            ],
-            'genre_hint': 'Tamil and Kollywood music'
-        }
-    
+    ('tamil',
+     (('tamil', 'tamil song', 'tamil music', 'kollywood', 'chennai music'),),
+     ('tamil songs', 'kollywood music', 'tamil movie songs', 'tamil folk',
+      'a r rahman tamil', 'ilaiyaraaja', 'harris jayaraj', 'anirudh ravichander',
+      'yuvan shankar raja', 'tamil romantic', 'tamil melody', 'tamil kuthu',
+      'tamil classical', 'carnatic music', 'tamil devotional', 'murugan songs',
+      'tamil gaana', 'chennai gana', 'tamil rap', 'hip hop tamizha', 'tamil independent',
+      'tamil indie', 'thalapathy songs', 'ajith songs', 'suriya songs', 'dhanush songs',
+      'tamil latest', 'tamil hits'),
+     'Tamil and Kollywood music'),
+
     # Telugu music (Tollywood)
-    elif any(word in message_lower for word in ['telugu', 'telugu song', 'telugu music', 'tollywood', 'hyderabad music']):
-        return {
-            'type': 'telugu',
-            'search_terms': [
-                'telugu songs', 'tollywood music', 'telugu movie songs', 'telugu folk',
-                'devi sri prasad', 'thaman', 'mickey j meyer', 'gopi sundar telugu',
-                'telugu romantic', 'telugu melody', 'telugu mass', 'telugu classical',
-                'annamayya songs', 'tyagaraja kritis telugu', 'telugu devotional',
-                'telugu folk songs', 'telugu village songs', 'telugu indie',
-                'pawan kalyan songs', 'mahesh babu songs', 'ram charan songs',
-                'allu arjun songs', 'jr ntr songs', 'telugu latest', 'telugu hits'
-            ],
-            'genre_hint': 'Telugu and Tollywood music'
-        }
-    
+    ('telugu',
+     (('telugu', 'telugu song', 'telugu music', 'tollywood', 'hyderabad music'),),
+     ('telugu songs', 'tollywood music', 'telugu movie songs', 'telugu folk',
+      'devi sri prasad', 'thaman', 'mickey j meyer', 'gopi sundar telugu',
+      'telugu romantic', 'telugu melody', 'telugu mass', 'telugu classical',
+      'annamayya songs', 'tyagaraja kritis telugu', 'telugu devotional',
+      'telugu folk songs', 'telugu village songs', 'telugu indie', 'pawan kalyan songs',
+      'mahesh babu songs', 'ram charan songs', 'allu arjun songs', 'jr ntr songs',
+      'telugu latest', 'telugu hits'),
+     'Telugu and Tollywood music'),
+
     # Punjabi music
-    elif any(word in message_lower for word in ['punjabi', 'punjabi song', 'punjabi music', 'bhangra', 'punjab music']):
-        return {
-            'type': 'punjabi',
-            'search_terms': [
-                'punjabi songs', 'bhangra music', 'punjabi folk', 'punjabi pop',
-                'diljit dosanjh', 'gurdas maan', 'babbu maan', 'ammy virk',
-                'hardy sandhu', 'guru randhawa', 'sidhu moose wala', 'karan aujla',
-                'punjabi romantic', 'punjabi sad', 'punjabi party', 'punjabi dhol',
-                'punjabi classical', 'gurbani', 'punjabi devotional', 'punjabi rap',
-                'punjabi hip hop', 'punjabi indie', 'punjabi latest', 'punjabi hits',
-                'pollywood music', 'punjabi movie songs', 'sufi punjabi'
-            ],
-            'genre_hint': 'Punjabi and Bhangra music'
-        }
-    
+    ('punjabi',
+     (('punjabi', 'punjabi song', 'punjabi music', 'bhangra', 'punjab music'),),
+     ('punjabi songs', 'bhangra music', 'punjabi folk', 'punjabi pop', 'diljit dosanjh',
+      'gurdas maan', 'babbu maan', 'ammy virk', 'hardy sandhu', 'guru randhawa',
+      'sidhu moose wala', 'karan aujla', 'punjabi romantic', 'punjabi sad', 'punjabi party',
+      'punjabi dhol', 'punjabi classical', 'gurbani', 'punjabi devotional', 'punjabi rap',
+      'punjabi hip hop', 'punjabi indie', 'punjabi latest', 'punjabi hits',
+      'pollywood music', 'punjabi movie songs', 'sufi punjabi'),
+     'Punjabi and Bhangra music'),
+
     # Afrobeats and African music
-    elif any(word in message_lower for word in ['afrobeats', 'afro beats', 'african', 'nigerian', 'ghana music', 'afro music', 'african song']):
-        return {
-            'type': 'afrobeats',
-            'search_terms': [
-                'afrobeats', 'afro beats', 'nigerian music', 'ghana music', 'african music',
-                'burna boy', 'wizkid', 'davido', 'tiwa savage', 'yemi alade',
-                'mr eazi', 'tekno', 'runtown', 'patoranking', 'stonebwoy',
-                'shatta wale', 'sarkodie', 'kcee', 'flavour', 'phyno',
-                'afro pop', 'afro fusion', 'afro trap', 'afro house', 'amapiano',
-                'highlife', 'juju music', 'fuji music', 'african drums',
-                'west african music', 'east african music', 'south african music',
-                'kenyan music', 'ethiopian music', 'congolese music', 'soukous'
-            ],
-            'genre_hint': 'Afrobeats and African music'
-        }
-    
+    ('afrobeats',
+     (('afrobeats', 'afro beats', 'african', 'nigerian', 'ghana music', 'afro music',
+       'african song'),),
+     ('afrobeats', 'afro beats', 'nigerian music', 'ghana music', 'african music',
+      'burna boy', 'wizkid', 'davido', 'tiwa savage', 'yemi alade', 'mr eazi', 'tekno',
+      'runtown', 'patoranking', 'stonebwoy', 'shatta wale', 'sarkodie', 'kcee', 'flavour',
+      'phyno', 'afro pop', 'afro fusion', 'afro trap', 'afro house', 'amapiano', 'highlife',
+      'juju music', 'fuji music', 'african drums', 'west african music',
+      'east african music', 'south african music', 'kenyan music', 'ethiopian music',
+      'congolese music', 'soukous'),
+     'Afrobeats and African music'),
+
     # East African music
-    elif any(word in message_lower for word in ['kenyan', 'kenya music', 'east african', 'swahili music', 'bongo flava']):
-        return {
-            'type': 'east_african',
-            'search_terms': [
-                'kenyan music', 'bongo flava', 'swahili music', 'east african music',
-                'diamond platnumz', 'rayvanny', 'harmonize', 'ali kiba', 'vanessa mdee',
-                'sauti sol', 'akothee', 'bahati', 'willy paul', 'nyashinski',
-                'tanzanian music', 'ugandan music', 'rwandan music', 'ethiopian music',
-                'amharic music', 'oromo music', 'taarab music', 'benga music',
-                'kapuka music', 'genge music', 'afro zoom', 'singeli'
-            ],
-            'genre_hint': 'East African and Swahili music'
-        }
-    
+    ('east_african',
+     (('kenyan', 'kenya music', 'east african', 'swahili music', 'bongo flava'),),
+     ('kenyan music', 'bongo flava', 'swahili music', 'east african music',
+      'diamond platnumz', 'rayvanny', 'harmonize', 'ali kiba', 'vanessa mdee', 'sauti sol',
+      'akothee', 'bahati', 'willy paul', 'nyashinski', 'tanzanian music', 'ugandan music',
+      'rwandan music', 'ethiopian music', 'amharic music', 'oromo music', 'taarab music',
+      'benga music', 'kapuka music', 'genge music', 'afro zoom', 'singeli'),
+     'East African and Swahili music'),
+
     # Caribbean music (Reggae, Dancehall, etc.)
-    elif any(word in message_lower for word in ['reggae', 'jamaican', 'caribbean', 'dancehall', 'soca', 'calypso']):
-        return {
-            'type': 'caribbean',
-            'search_terms': [
-                'reggae music', 'jamaican music', 'caribbean music', 'dancehall',
-                'bob marley', 'jimmy cliff', 'toots hibbert', 'burning spear',
-                'shaggy', 'sean paul', 'beenie man', 'bounty killer', 'vybz kartel',
-                'chronixx', 'protoje', 'koffee', 'spice dancehall', 'popcaan',
-                'soca music', 'calypso music', 'trinidad music', 'barbados music',
-                'steel drum', 'carnival music', 'mento music', 'ska music',
-                'rocksteady', 'roots reggae', 'dub music', 'ragga music'
-            ],
-            'genre_hint': 'Reggae and Caribbean music'
-        }
-    
+    ('caribbean',
+     (('reggae', 'jamaican', 'caribbean', 'dancehall', 'soca', 'calypso'),),
+     ('reggae music', 'jamaican music', 'caribbean music', 'dancehall', 'bob marley',
+      'jimmy cliff', 'toots hibbert', 'burning spear', 'shaggy', 'sean paul', 'beenie man',
+      'bounty killer', 'vybz kartel', 'chronixx', 'protoje', 'koffee', 'spice dancehall',
+      'popcaan', 'soca music', 'calypso music', 'trinidad music', 'barbados music',
+      'steel drum', 'carnival music', 'mento music', 'ska music', 'rocksteady',
+      'roots reggae', 'dub music', 'ragga music'),
+     'Reggae and Caribbean music'),
+
     # Brazilian music
-    elif any(word in message_lower for word in ['brazilian', 'brazil music', 'portuguese music', 'bossa nova', 'samba', 'forró']):
-        return {
-            'type': 'brazilian',
-            'search_terms': [
-                'brazilian music', 'bossa nova', 'samba', 'forró', 'mpb',
-                'anitta', 'ludmilla', 'wesley safadão', 'gusttavo lima', 'marília mendonça',
-                'caetano veloso', 'gilberto gil', 'chico buarque', 'maria bethânia',
-                'tropicália', 'axé music', 'pagode', 'funk carioca', 'brazilian funk',
-                'sertanejo', 'brazilian pop', 'brazilian rock', 'brazilian hip hop',
-                'baião', 'frevo', 'choro', 'maracatu', 'lambada'
-            ],
-            'genre_hint': 'Brazilian and Portuguese music'
-        }
-    
+    ('brazilian',
+     (('brazilian', 'brazil music', 'portuguese music', 'bossa nova', 'samba', 'forró'),),
+     ('brazilian music', 'bossa nova', 'samba', 'forró', 'mpb', 'anitta', 'ludmilla',
+      'wesley safadão', 'gusttavo lima', 'marília mendonça', 'caetano veloso',
+      'gilberto gil', 'chico buarque', 'maria bethânia', 'tropicália', 'axé music',
+      'pagode', 'funk carioca', 'brazilian funk', 'sertanejo', 'brazilian pop',
+      'brazilian rock', 'brazilian hip hop', 'baião', 'frevo', 'choro', 'maracatu',
+      'lambada'),
+     'Brazilian and Portuguese music'),
+
     # Hindi/Bollywood music
-    elif any(word in message_lower for word in ['hindi', 'bollywood', 'indian music', 'hindi song']):
-        return {
-            'type': 'hindi_bollywood',
-            'search_terms': [
-                'bollywood music', 'hindi songs', 'hindi movie songs', 'bollywood hits',
-                'a r rahman', 'arijit singh', 'shreya ghoshal', 'lata mangeshkar',
-                'kishore kumar', 'mohammed rafi', 'asha bhosle', 'sonu nigam',
-                'atif aslam', 'rahat fateh ali khan', 'mohit chauhan', 'armaan malik',
-                'sunidhi chauhan', 'shaan', 'kk singer', 'udit narayan',
-                'hindi romantic songs', 'bollywood dance', 'hindi pop',
-                'indian classical', 'qawwali', 'devotional hindi', 'bollywood old',
-                'bollywood new', 'hindi indie', 'bollywood item songs'
-            ],
-            'genre_hint': 'Hindi Bollywood music'
-        }
-    
+    ('hindi_bollywood',
+     (('hindi', 'bollywood', 'indian music', 'hindi song'),),
+     ('bollywood music', 'hindi songs', 'hindi movie songs', 'bollywood hits', 'a r rahman',
+      'arijit singh', 'shreya ghoshal', 'lata mangeshkar', 'kishore kumar', 'mohammed rafi',
+      'asha bhosle', 'sonu nigam', 'atif aslam', 'rahat fateh ali khan', 'mohit chauhan',
+      'armaan malik', 'sunidhi chauhan', 'shaan', 'kk singer', 'udit narayan',
+      'hindi romantic songs', 'bollywood dance', 'hindi pop', 'indian classical', 'qawwali',
+      'devotional hindi', 'bollywood old', 'bollywood new', 'hindi indie',
+      'bollywood item songs'),
+     'Hindi Bollywood music'),
+
     # Japanese and Anime music
-    elif any(word in message_lower for word in ['anime', 'japanese', 'jpop', 'j-pop', 'otaku', 'weeb', 'manga']):
-        return {
-            'type': 'anime_japanese',
-            'search_terms': [
-                'japanese anime opening', 'anime soundtrack', 'jpop', 'japanese music',
-                'j-rock', 'japanese electronic', 'anime ost', 'naruto opening',
-                'studio ghibli', 'japanese indie', 'visual kei', 'shibuya-kei',
-                'japanese punk', 'japanese metal', 'vocaloid', 'japanese folk'
-            ],
-            'genre_hint': 'Japanese anime or J-pop music'
-        }
-    
+    ('anime_japanese',
+     (('anime', 'japanese', 'jpop', 'j-pop', 'otaku', 'weeb', 'manga'),),
+     ('japanese anime opening', 'anime soundtrack', 'jpop', 'japanese music', 'j-rock',
+      'japanese electronic', 'anime ost', 'naruto opening', 'studio ghibli',
+      'japanese indie', 'visual kei', 'shibuya-kei', 'japanese punk', 'japanese metal',
+      'vocaloid', 'japanese folk'),
+     'Japanese anime or J-pop music'),
+
     # K-pop and Korean music
-    elif any(word in message_lower for word in ['kpop', 'k-pop', 'korean', 'bts', 'blackpink', 'twice']):
-        return {
-            'type': 'kpop',
-            'search_terms': [
-                'kpop', 'korean pop', 'korean music', 'k-indie', 'korean rock',
-                'korean hip hop', 'korean ballad', 'korean electronic', 'korean r&b',
-                'korean folk', 'korean alternative', 'korean punk', 'k-rock'
-            ],
-            'genre_hint': 'K-pop or Korean music'
-        }
-    
+    ('kpop',
+     (('kpop', 'k-pop', 'korean', 'bts', 'blackpink', 'twice'),),
+     ('kpop', 'korean pop', 'korean music', 'k-indie', 'korean rock', 'korean hip hop',
+      'korean ballad', 'korean electronic', 'korean r&b', 'korean folk',
+      'korean alternative', 'korean punk', 'k-rock'),
+     'K-pop or Korean music'),
+
     # Rock and metal genres
-    elif any(word in message_lower for word in ['rock', 'metal', 'punk', 'grunge', 'alternative']):
-        return {
-            'type': 'rock',
-            'search_terms': [
-                'rock music', 'alternative rock', 'indie rock', 'classic rock',
-                'progressive rock', 'punk rock', 'grunge', 'post-rock',
-                'metal', 'hard rock', 'soft rock', 'psychedelic rock',
-                'garage rock', 'folk rock', 'blues rock', 'arena rock'
-            ],
-            'genre_hint': 'rock music'
-        }
-    
+    ('rock',
+     (('rock', 'metal', 'punk', 'grunge', 'alternative'),),
+     ('rock music', 'alternative rock', 'indie rock', 'classic rock', 'progressive rock',
+      'punk rock', 'grunge', 'post-rock', 'metal', 'hard rock', 'soft rock',
+      'psychedelic rock', 'garage rock', 'folk rock', 'blues rock', 'arena rock'),
+     'rock music'),
+
     # Hip-hop and rap
-    elif any(word in message_lower for word in ['rap', 'hip hop', 'hip-hop', 'trap', 'drill']):
-        return {
-            'type': 'hiphop',
-            'search_terms': [
-                'hip hop', 'rap music', 'hip-hop', 'trap music', 'drill rap',
-                'old school hip hop', 'conscious rap', 'gangsta rap', 'mumble rap',
-                'underground hip hop', 'boom bap', 'trap beats', 'rap battles',
-                'freestyle rap', 'east coast rap', 'west coast rap', 'southern rap'
-            ],
-            'genre_hint': 'hip-hop or rap music'
-        }
-    
+    ('hiphop',
+     (('rap', 'hip hop', 'hip-hop', 'trap', 'drill'),),
+     ('hip hop', 'rap music', 'hip-hop', 'trap music', 'drill rap', 'old school hip hop',
+      'conscious rap', 'gangsta rap', 'mumble rap', 'underground hip hop', 'boom bap',
+      'trap beats', 'rap battles', 'freestyle rap', 'east coast rap', 'west coast rap',
+      'southern rap'),
+     'hip-hop or rap music'),
+
     # Pop music
-    elif any(word in message_lower for word in ['pop', 'mainstream', 'radio', 'chart', 'hits']):
-        return {
-            'type': 'pop',
-            'search_terms': [
-                'pop music', 'mainstream pop', 'indie pop', 'synth pop', 'dance pop',
-                'electropop', 'pop rock', 'teen pop', 'adult contemporary',
-                'power pop', 'art pop', 'chamber pop', 'dream pop', 'pop punk'
-            ],
-            'genre_hint': 'pop music'
-        }
-    
+    ('pop',
+     (('pop', 'mainstream', 'radio', 'chart', 'hits'),),
+     ('pop music', 'mainstream pop', 'indie pop', 'synth pop', 'dance pop', 'electropop',
+      'pop rock', 'teen pop', 'adult contemporary', 'power pop', 'art pop', 'chamber pop',
+      'dream pop', 'pop punk'),
+     'pop music'),
+
     # Electronic and dance music
-    elif any(word in message_lower for word in ['electronic', 'edm', 'techno', 'house', 'dubstep']):
-        return {
-            'type': 'electronic',
-            'search_terms': [
-                'electronic music', 'edm', 'techno', 'house music', 'dubstep',
-                'trance', 'drum and bass', 'ambient electronic', 'chillwave',
-                'synthwave', 'future bass', 'deep house', 'progressive house',
-                'electro house', 'minimal techno', 'acid house', 'breakbeat'
-            ],
-            'genre_hint': 'electronic and dance music'
-        }
-    
+    ('electronic',
+     (('electronic', 'edm', 'techno', 'house', 'dubstep'),),
+     ('electronic music', 'edm', 'techno', 'house music', 'dubstep', 'trance',
+      'drum and bass', 'ambient electronic', 'chillwave', 'synthwave', 'future bass',
+      'deep house', 'progressive house', 'electro house', 'minimal techno', 'acid house',
+      'breakbeat'),
+     'electronic and dance music'),
+
     # Niche and experimental genres
-    
     # Post-rock and instrumental
-    elif any(word in message_lower for word in ['post-rock', 'post rock', 'instrumental rock', 'epic instrumental']):
-        return {
-            'type': 'post_rock',
-            'search_terms': [
-                'post-rock', 'instrumental rock', 'epic instrumental', 'cinematic rock',
-                'godspeed you black emperor', 'explosions in the sky', 'this will destroy you',
-                'mono', 'russian circles', 'sigur ros', 'epic guitar', 'atmospheric rock'
-            ],
-            'genre_hint': 'post-rock and epic instrumental music'
-        }
-    
+    ('post_rock',
+     (('post-rock', 'post rock', 'instrumental rock', 'epic instrumental'),),
+     ('post-rock', 'instrumental rock', 'epic instrumental', 'cinematic rock',
+      'godspeed you black emperor', 'explosions in the sky', 'this will destroy you',
+      'mono', 'russian circles', 'sigur ros', 'epic guitar', 'atmospheric rock'),
+     'post-rock and epic instrumental music'),
+
     # Ambient and atmospheric music
-    elif any(word in message_lower for word in ['ambient', 'atmospheric', 'soundscape', 'drone', 'minimal']):
-        return {
-            'type': 'ambient',
-            'search_terms': [
-                'ambient music', 'atmospheric music', 'drone music', 'soundscape',
-                'brian eno', 'tim hecker', 'william basinski', 'stars of the lid',
-                'minimal ambient', 'dark ambient', 'field recordings', 'sound art',
-                'new age', 'meditation music', 'space music', 'ethereal ambient'
-            ],
-            'genre_hint': 'ambient and atmospheric music'
-        }
-    
+    ('ambient',
+     (('ambient', 'atmospheric', 'soundscape', 'drone', 'minimal'),),
+     ('ambient music', 'atmospheric music', 'drone music', 'soundscape', 'brian eno',
+      'tim hecker', 'william basinski', 'stars of the lid', 'minimal ambient',
+      'dark ambient', 'field recordings', 'sound art', 'new age', 'meditation music',
+      'space music', 'ethereal ambient'),
+     'ambient and atmospheric music'),
+
     # Shoegaze and dream pop
-    elif any(word in message_lower for word in ['shoegaze', 'dream pop', 'ethereal', 'wall of sound']):
-        return {
-            'type': 'shoegaze',
-            'search_terms': [
-                'shoegaze', 'dream pop', 'my bloody valentine', 'slowdive', 'ride',
-                'cocteau twins', 'beach house', 'mazzy star', 'ethereal wave',
-                'noise pop', 'wall of sound', 'reverb heavy', 'atmospheric pop'
-            ],
-            'genre_hint': 'shoegaze and dream pop music'
-        }
-    
+    ('shoegaze',
+     (('shoegaze', 'dream pop', 'ethereal', 'wall of sound'),),
+     ('shoegaze', 'dream pop', 'my bloody valentine', 'slowdive', 'ride', 'cocteau twins',
+      'beach house', 'mazzy star', 'ethereal wave', 'noise pop', 'wall of sound',
+      'reverb heavy', 'atmospheric pop'),
+     'shoegaze and dream pop music'),
+
     # Mainstream hits and chart toppers
-    elif any(word in message_lower for word in ['mainstream', 'chart hits', 'billboard', 'radio hits', 'viral']):
-        return {
-            'type': 'mainstream',
-            'search_terms': [
-                'taylor swift', 'drake', 'billie eilish', 'post malone', 'ariana grande',
-                'the weeknd', 'dua lipa', 'olivia rodrigo', 'harry styles', 'bad bunny',
-                'chart hits', 'billboard top', 'mainstream pop', 'radio hits', 'viral hits',
-                'trending songs', 'popular music', 'hit songs', 'top 40'
-            ],
-            'genre_hint': 'mainstream hits and chart toppers'
-        }
-    
+    ('mainstream',
+     (('mainstream', 'chart hits', 'billboard', 'radio hits', 'viral'),),
+     ('taylor swift', 'drake', 'billie eilish', 'post malone', 'ariana grande',
+      'the weeknd', 'dua lipa', 'olivia rodrigo', 'harry styles', 'bad bunny', 'chart hits',
+      'billboard top', 'mainstream pop', 'radio hits', 'viral hits', 'trending songs',
+      'popular music', 'hit songs', 'top 40'),
+     'mainstream hits and chart toppers'),
+
     # Indie and alternative music
-    elif any(word in message_lower for word in ['indie', 'underground', 'alternative', 'experimental', 'art rock']):
-        return {
-            'type': 'indie',
-            'search_terms': [
-                'phoebe bridgers', 'tame impala', 'mac miller', 'clairo', 'boy pablo',
-                'rex orange county', 'beach house', 'vampire weekend', 'arctic monkeys',
-                'indie rock', 'indie pop', 'indie folk', 'indie electronic', 'bedroom pop',
-                'dream pop', 'art rock', 'experimental indie', 'lo-fi indie', 'indie sleaze'
-            ],
-            'genre_hint': 'indie and alternative discoveries'
-        }
-    
+    ('indie',
+     (('indie', 'underground', 'alternative', 'experimental', 'art rock'),),
+     ('phoebe bridgers', 'tame impala', 'mac miller', 'clairo', 'boy pablo',
+      'rex orange county', 'beach house', 'vampire weekend', 'arctic monkeys', 'indie rock',
+      'indie pop', 'indie folk', 'indie electronic', 'bedroom pop', 'dream pop', 'art rock',
+      'experimental indie', 'lo-fi indie', 'indie sleaze'),
+     'indie and alternative discoveries'),
+
     # Decade-specific music requests
-    
     # 1970s music
-    elif any(word in message_lower for word in ['70s', '1970s', 'seventies', 'disco era', 'classic rock era']):
-        return {
-            'type': 'seventies',
-            'search_terms': [
-                '70s hits', '1970s music', 'seventies', 'disco music', 'classic rock 70s',
-                'funk 70s', 'soul 70s', 'psychedelic rock', 'progressive rock 70s',
-                'folk rock 70s', 'hard rock 70s', 'glam rock', 'punk 70s', 'reggae 70s'
-            ],
-            'genre_hint': '1970s music and disco era hits'
-        }
-    
+    ('seventies',
+     (('70s', '1970s', 'seventies', 'disco era', 'classic rock era'),),
+     ('70s hits', '1970s music', 'seventies', 'disco music', 'classic rock 70s', 'funk 70s',
+      'soul 70s', 'psychedelic rock', 'progressive rock 70s', 'folk rock 70s',
+      'hard rock 70s', 'glam rock', 'punk 70s', 'reggae 70s'),
+     '1970s music and disco era hits'),
+
     # 1980s music
-    elif any(word in message_lower for word in ['80s', '1980s', 'eighties', 'new wave', 'synth pop']):
-        return {
-            'type': 'eighties',
-            'search_terms': [
-                '80s hits', '1980s music', 'eighties', 'new wave', 'synth pop',
-                'post-punk', 'new romantic', 'hair metal', 'glam metal', 'freestyle',
-                'electronic 80s', 'pop rock 80s', 'alternative 80s', 'dance 80s'
-            ],
-            'genre_hint': '1980s new wave and synth pop'
-        }
-    
+    ('eighties',
+     (('80s', '1980s', 'eighties', 'new wave', 'synth pop'),),
+     ('80s hits', '1980s music', 'eighties', 'new wave', 'synth pop', 'post-punk',
+      'new romantic', 'hair metal', 'glam metal', 'freestyle', 'electronic 80s',
+      'pop rock 80s', 'alternative 80s', 'dance 80s'),
+     '1980s new wave and synth pop'),
+
     # 1990s music
-    elif any(word in message_lower for word in ['90s', '1990s', 'nineties', 'grunge', 'alternative rock']):
-        return {
-            'type': 'nineties',
-            'search_terms': [
-                '90s hits', '1990s music', 'nineties', 'grunge', 'alternative rock 90s',
-                'britpop', 'trip-hop', 'electronic 90s', 'hip hop 90s', 'r&b 90s',
-                'indie rock 90s', 'shoegaze 90s', 'post-rock 90s', 'rave music'
-            ],
-            'genre_hint': '1990s grunge and alternative rock'
-        }
-    
+    ('nineties',
+     (('90s', '1990s', 'nineties', 'grunge', 'alternative rock'),),
+     ('90s hits', '1990s music', 'nineties', 'grunge', 'alternative rock 90s', 'britpop',
+      'trip-hop', 'electronic 90s', 'hip hop 90s', 'r&b 90s', 'indie rock 90s',
+      'shoegaze 90s', 'post-rock 90s', 'rave music'),
+     '1990s grunge and alternative rock'),
+
     # 2000s music
-    elif any(word in message_lower for word in ['2000s', 'early 2000s', 'y2k', 'millennium', 'emo']):
-        return {
-            'type': 'two_thousands',
-            'search_terms': [
-                '2000s hits', 'early 2000s', 'y2k music', 'millennium music', 'emo',
-                'pop punk 2000s', 'nu metal', 'garage rock revival', 'crunk',
-                'teen pop 2000s', 'r&b 2000s', 'indie rock 2000s', 'post-hardcore'
-            ],
-            'genre_hint': '2000s emo and pop punk era'
-        }
-    
+    ('two_thousands',
+     (('2000s', 'early 2000s', 'y2k', 'millennium', 'emo'),),
+     ('2000s hits', 'early 2000s', 'y2k music', 'millennium music', 'emo', 'pop punk 2000s',
+      'nu metal', 'garage rock revival', 'crunk', 'teen pop 2000s', 'r&b 2000s',
+      'indie rock 2000s', 'post-hardcore'),
+     '2000s emo and pop punk era'),
+
     # Emotion-based music requests
-    
     # Positive emotions
-    elif any(word in message_lower for word in ['happy', 'joyful', 'cheerful', 'sunny', 'upbeat', 'good mood']):
-        return {
-            'type': 'happy',
-            'search_terms': [
-                'happy songs', 'feel good music', 'upbeat pop', 'cheerful music',
-                'joyful indie', 'sunny reggae', 'happy folk', 'uplifting soul',
-                'positive vibes', 'good mood rock', 'happy electronic', 'cheerful jazz',
-                'feel good hip hop', 'happy country', 'upbeat latin', 'joyful gospel'
-            ],
-            'genre_hint': 'happy and uplifting music'
-        }
-    
-    elif any(word in message_lower for word in ['excited', 'thrilled', 'pumped', 'hyped', 'stoked', 'energetic']):
-        return {
-            'type': 'excited',
-            'search_terms': [
-                'pump up songs', 'hype music', 'energetic pop', 'party anthems',
-                'high energy rock', 'intense electronic', 'adrenaline music',
-                'workout songs', 'explosive beats', 'epic music', 'power anthems',
-                'motivational rock', 'intense rap', 'high tempo', 'festival bangers'
-            ],
-            'genre_hint': 'exciting and energetic music'
-        }
-    
-    elif any(word in message_lower for word in ['love', 'romantic', 'affectionate', 'passionate', 'tender', 'romance']):
-        return {
-            'type': 'romantic',
-            'search_terms': [
-                'love songs', 'romantic ballads', 'slow jams', 'romantic music',
-                'love ballads', 'romantic pop', 'romantic rock', 'romantic r&b',
-                'acoustic love songs', 'romantic indie', 'love duets', 'romantic jazz',
-                'romantic soul', 'romantic country', 'romantic folk', 'serenades'
-            ],
-            'genre_hint': 'romantic and love songs'
-        }
-    
-    elif any(word in message_lower for word in ['confident', 'empowered', 'strong', 'bold', 'powerful', 'badass']):
-        return {
-            'type': 'confident',
-            'search_terms': [
-                'empowerment anthems', 'confidence boosters', 'powerful songs', 'boss music',
-                'strong female vocals', 'empowering hip hop', 'confident pop', 'bold rock',
-                'powerful ballads', 'badass songs', 'strong anthems', 'fierce music'
-            ],
-            'genre_hint': 'confident and empowering music'
-        }
-    
-    elif any(word in message_lower for word in ['grateful', 'thankful', 'appreciative', 'blessed']):
-        return {
-            'type': 'grateful',
-            'search_terms': [
-                'grateful songs', 'thankful music', 'appreciation anthems', 'blessing songs',
-                'gratitude music', 'thankful folk', 'grateful rock', 'appreciation pop'
-            ],
-            'genre_hint': 'grateful and appreciative music'
-        }
-    
-    elif any(word in message_lower for word in ['peaceful', 'calm', 'serene', 'tranquil', 'chill', 'relaxed']):
-        return {
-            'type': 'peaceful',
-            'search_terms': [
-                'chill music', 'relaxing songs', 'peaceful acoustic', 'ambient chill',
-                'calm electronic', 'serene folk', 'tranquil jazz', 'peaceful piano',
-                'relaxing indie', 'chill hip hop', 'peaceful classical', 'calm pop'
-            ],
-            'genre_hint': 'peaceful and calming music'
-        }
-    
+    ('happy',
+     (('happy', 'joyful', 'cheerful', 'sunny', 'upbeat', 'good mood'),),
+     ('happy songs', 'feel good music', 'upbeat pop', 'cheerful music', 'joyful indie',
+      'sunny reggae', 'happy folk', 'uplifting soul', 'positive vibes', 'good mood rock',
+      'happy electronic', 'cheerful jazz', 'feel good hip hop', 'happy country',
+      'upbeat latin', 'joyful gospel'),
+     'happy and uplifting music'),
+
+    ('excited',
+     (('excited', 'thrilled', 'pumped', 'hyped', 'stoked', 'energetic'),),
+     ('pump up songs', 'hype music', 'energetic pop', 'party anthems', 'high energy rock',
+      'intense electronic', 'adrenaline music', 'workout songs', 'explosive beats',
+      'epic music', 'power anthems', 'motivational rock', 'intense rap', 'high tempo',
+      'festival bangers'),
+     'exciting and energetic music'),
+
+    ('romantic',
+     (('love', 'romantic', 'affectionate', 'passionate', 'tender', 'romance'),),
+     ('love songs', 'romantic ballads', 'slow jams', 'romantic music', 'love ballads',
+      'romantic pop', 'romantic rock', 'romantic r&b', 'acoustic love songs',
+      'romantic indie', 'love duets', 'romantic jazz', 'romantic soul', 'romantic country',
+      'romantic folk', 'serenades'),
+     'romantic and love songs'),
+
+    ('confident',
+     (('confident', 'empowered', 'strong', 'bold', 'powerful', 'badass'),),
+     ('empowerment anthems', 'confidence boosters', 'powerful songs', 'boss music',
+      'strong female vocals', 'empowering hip hop', 'confident pop', 'bold rock',
+      'powerful ballads', 'badass songs', 'strong anthems', 'fierce music'),
+     'confident and empowering music'),
+
+    ('grateful',
+     (('grateful', 'thankful', 'appreciative', 'blessed'),),
+     ('grateful songs', 'thankful music', 'appreciation anthems', 'blessing songs',
+      'gratitude music', 'thankful folk', 'grateful rock', 'appreciation pop'),
+     'grateful and appreciative music'),
+
+    ('peaceful',
+     (('peaceful', 'calm', 'serene', 'tranquil', 'chill', 'relaxed'),),
+     ('chill music', 'relaxing songs', 'peaceful acoustic', 'ambient chill',
+      'calm electronic', 'serene folk', 'tranquil jazz', 'peaceful piano', 'relaxing indie',
+      'chill hip hop', 'peaceful classical', 'calm pop'),
+     'peaceful and calming music'),
+
     # Negative emotions
-    elif any(word in message_lower for word in ['sad', 'melancholic', 'sorrowful', 'heartbroken', 'depressed', 'down']):
-        return {
-            'type': 'sad',
-            'search_terms': [
-                'sad songs', 'melancholic music', 'heartbreak ballads', 'emotional songs',
-                'depressing music', 'sad indie', 'melancholy folk', 'sad acoustic',
-                'breakup songs', 'crying songs', 'sad piano', 'emotional ballads',
-                'sad alternative', 'melancholic electronic', 'sad country', 'blues music'
-            ],
-            'genre_hint': 'sad and emotional music'
-        }
-    
-    elif any(word in message_lower for word in ['angry', 'furious', 'aggressive', 'mad', 'rage', 'pissed']):
-        return {
-            'type': 'angry',
-            'search_terms': [
-                'angry music', 'aggressive rock', 'metal songs', 'rage music',
-                'hardcore punk', 'angry rap', 'aggressive electronic', 'thrash metal',
-                'nu metal', 'angry alternative', 'hardcore music', 'intense rock',
-                'angry hip hop', 'aggressive indie', 'punk rock', 'death metal'
-            ],
-            'genre_hint': 'angry and aggressive music'
-        }
-    
-    elif any(word in message_lower for word in ['anxious', 'worried', 'nervous', 'stressed', 'anxiety', 'panic']):
-        return {
-            'type': 'anxious',
-            'search_terms': [
-                'calming music', 'anxiety relief songs', 'soothing tracks', 'stress relief',
-                'peaceful ambient', 'relaxing classical', 'calming indie', 'soothing folk'
-            ],
-            'genre_hint': 'calming music for anxiety relief'
-        }
-    
-    elif any(word in message_lower for word in ['lonely', 'isolated', 'empty', 'longing', 'alone']):
-        return {
-            'type': 'lonely',
-            'search_terms': [
-                'lonely songs', 'isolation music', 'longing ballads', 'alone time tracks',
-                'solitude music', 'lonely indie', 'melancholy folk', 'isolation rock'
-            ],
-            'genre_hint': 'music for lonely moments'
-        }
-    
+    ('sad',
+     (('sad', 'melancholic', 'sorrowful', 'heartbroken', 'depressed', 'down'),),
+     ('sad songs', 'melancholic music', 'heartbreak ballads', 'emotional songs',
+      'depressing music', 'sad indie', 'melancholy folk', 'sad acoustic', 'breakup songs',
+      'crying songs', 'sad piano', 'emotional ballads', 'sad alternative',
+      'melancholic electronic', 'sad country', 'blues music'),
+     'sad and emotional music'),
+
+    ('angry',
+     (('angry', 'furious', 'aggressive', 'mad', 'rage', 'pissed'),),
+     ('angry music', 'aggressive rock', 'metal songs', 'rage music', 'hardcore punk',
+      'angry rap', 'aggressive electronic', 'thrash metal', 'nu metal', 'angry alternative',
+      'hardcore music', 'intense rock', 'angry hip hop', 'aggressive indie', 'punk rock',
+      'death metal'),
+     'angry and aggressive music'),
+
+    ('anxious',
+     (('anxious', 'worried', 'nervous', 'stressed', 'anxiety', 'panic'),),
+     ('calming music', 'anxiety relief songs', 'soothing tracks', 'stress relief',
+      'peaceful ambient', 'relaxing classical', 'calming indie', 'soothing folk'),
+     'calming music for anxiety relief'),
+
+    ('lonely',
+     (('lonely', 'isolated', 'empty', 'longing', 'alone'),),
+     ('lonely songs', 'isolation music', 'longing ballads', 'alone time tracks',
+      'solitude music', 'lonely indie', 'melancholy folk', 'isolation rock'),
+     'music for lonely moments'),
+
     # Latin and Spanish music
-    elif any(word in message_lower for word in ['latin', 'spanish', 'reggaeton', 'salsa', 'bachata']):
-        return {
-            'type': 'latin',
-            'search_terms': [
-                'latin music', 'reggaeton', 'salsa', 'bachata', 'spanish music',
-                'merengue', 'cumbia', 'latin pop', 'spanish rock', 'latin hip hop',
-                'flamenco', 'bossa nova', 'samba', 'tango', 'mariachi', 'latin jazz'
-            ],
-            'genre_hint': 'Latin and Spanish music'
-        }
-    
+    ('latin',
+     (('latin', 'spanish', 'reggaeton', 'salsa', 'bachata'),),
+     ('latin music', 'reggaeton', 'salsa', 'bachata', 'spanish music', 'merengue', 'cumbia',
+      'latin pop', 'spanish rock', 'latin hip hop', 'flamenco', 'bossa nova', 'samba',
+      'tango', 'mariachi', 'latin jazz'),
+     'Latin and Spanish music'),
+
     # Activity-based music requests
-    
     # Workout and fitness music
-    elif any(word in message_lower for word in ['workout', 'gym', 'cardio', 'strength', 'exercise', 'fitness']):
-        return {
-            'type': 'workout',
-            'search_terms': [
-                'workout music', 'gym songs', 'cardio tracks', 'fitness anthems',
-                'running music', 'weightlifting songs', 'exercise music', 'training beats',
-                'high energy workout', 'intense fitness', 'power training', 'HIIT music',
-                'crossfit music', 'spinning music', 'marathon music', 'athletic anthems'
-            ],
-            'genre_hint': 'workout and fitness music'
-        }
-    
+    ('workout',
+     (('workout', 'gym', 'cardio', 'strength', 'exercise', 'fitness'),),
+     ('workout music', 'gym songs', 'cardio tracks', 'fitness anthems', 'running music',
+      'weightlifting songs', 'exercise music', 'training beats', 'high energy workout',
+      'intense fitness', 'power training', 'HIIT music', 'crossfit music', 'spinning music',
+      'marathon music', 'athletic anthems'),
+     'workout and fitness music'),
+
     # Study and focus music
-    elif any(word in message_lower for word in ['study', 'focus', 'concentration', 'work', 'productive']):
-        return {
-            'type': 'study',
-            'search_terms': [
-                'study music', 'focus tracks', 'concentration songs', 'productive vibes',
-                'ambient study', 'lo-fi hip hop', 'classical study', 'peaceful instrumental',
-                'brain music', 'meditation music', 'white noise', 'nature sounds',
-                'minimal electronic', 'study beats', 'calm piano', 'reading music'
-            ],
-            'genre_hint': 'study and focus music'
-        }
-    
+    ('study',
+     (('study', 'focus', 'concentration', 'work', 'productive'),),
+     ('study music', 'focus tracks', 'concentration songs', 'productive vibes',
+      'ambient study', 'lo-fi hip hop', 'classical study', 'peaceful instrumental',
+      'brain music', 'meditation music', 'white noise', 'nature sounds',
+      'minimal electronic', 'study beats', 'calm piano', 'reading music'),
+     'study and focus music'),
+
     # Party and dance music
-    elif any(word in message_lower for word in ['party', 'celebration', 'dance', 'social', 'club']):
-        return {
-            'type': 'party',
-            'search_terms': [
-                'party music', 'dance songs', 'celebration tracks', 'club anthems',
-                'party bangers', 'dance hits', 'club music', 'party pop',
-                'festival music', 'dance floor', 'party rock', 'upbeat dance',
-                'party hip hop', 'dance electronic', 'party classics', 'celebration songs'
-            ],
-            'genre_hint': 'party and dance music'
-        }
-    
+    ('party',
+     (('party', 'celebration', 'dance', 'social', 'club'),),
+     ('party music', 'dance songs', 'celebration tracks', 'club anthems', 'party bangers',
+      'dance hits', 'club music', 'party pop', 'festival music', 'dance floor',
+      'party rock', 'upbeat dance', 'party hip hop', 'dance electronic', 'party classics',
+      'celebration songs'),
+     'party and dance music'),
+
     # Driving and travel music
-    elif any(word in message_lower for word in ['driving', 'road trip', 'cruising', 'car', 'highway']):
-        return {
-            'type': 'driving',
-            'search_terms': [
-                'driving music', 'road trip songs', 'cruising tracks', 'highway anthems',
-                'car music', 'travel songs', 'journey music', 'road music'
-            ],
-            'genre_hint': 'driving and road trip music'
-        }
-    
+    ('driving',
+     (('driving', 'road trip', 'cruising', 'car', 'highway'),),
+     ('driving music', 'road trip songs', 'cruising tracks', 'highway anthems', 'car music',
+      'travel songs', 'journey music', 'road music'),
+     'driving and road trip music'),
+
     # Modern digital culture music categories
-    
     # Gaming and epic music
-    elif any(word in message_lower for word in ['gaming', 'games', 'video game', 'epic', 'boss battle', 'rpg']):
-        return {
-            'type': 'gaming',
-            'search_terms': [
-                'gaming music', 'epic electronic', 'video game soundtracks', 'boss battle',
-                'epic orchestral', 'cinematic music', 'dramatic electronic', 'intense gaming',
-                'rpg music', 'fantasy music', 'adventure music', 'heroic music',
-                'epic trailer music', 'powerful orchestral', 'dramatic scores'
-            ],
-            'genre_hint': 'gaming and epic music'
-        }
-    
+    ('gaming',
+     (('gaming', 'games', 'video game', 'epic', 'boss battle', 'rpg'),),
+     ('gaming music', 'epic electronic', 'video game soundtracks', 'boss battle',
+      'epic orchestral', 'cinematic music', 'dramatic electronic', 'intense gaming',
+      'rpg music', 'fantasy music', 'adventure music', 'heroic music', 'epic trailer music',
+      'powerful orchestral', 'dramatic scores'),
+     'gaming and epic music'),
+
     # Lo-fi and study beats
-    elif any(word in message_lower for word in ['lofi', 'lo-fi', 'chill hop', 'study beats', 'aesthetic']):
-        return {
-            'type': 'lofi',
-            'search_terms': [
-                'lo-fi hip hop', 'chill hop', 'study beats', 'lofi music',
-                'aesthetic music', 'chillwave', 'lo-fi beats', 'relaxing hip hop',
-                'calm beats', 'peaceful hip hop', 'ambient hip hop', 'dreamy beats',
-                'nostalgic beats', 'vintage hip hop', 'soft beats', 'mellow hip hop'
-            ],
-            'genre_hint': 'lo-fi and chill hop music'
-        }
-    
+    ('lofi',
+     (('lofi', 'lo-fi', 'chill hop', 'study beats', 'aesthetic'),),
+     ('lo-fi hip hop', 'chill hop', 'study beats', 'lofi music', 'aesthetic music',
+      'chillwave', 'lo-fi beats', 'relaxing hip hop', 'calm beats', 'peaceful hip hop',
+      'ambient hip hop', 'dreamy beats', 'nostalgic beats', 'vintage hip hop', 'soft beats',
+      'mellow hip hop'),
+     'lo-fi and chill hop music'),
+
     # Additional regional music categories
-    
     # Vietnamese music
-    elif any(word in message_lower for word in ['vietnamese', 'vietnam music', 'vpop', 'vietnamese song']):
-        return {
-            'type': 'vietnamese',
-            'search_terms': [
-                'vietnamese music', 'vpop', 'vietnam pop', 'vietnamese songs',
-                'son tung mtp', 'duc phuc', 'erik vietnam', 'chi pu',
-                'vietnamese ballad', 'vietnamese rap', 'vietnamese indie',
-                'vietnamese folk', 'vietnamese modern', 'ho chi minh music'
-            ],
-            'genre_hint': 'Vietnamese and V-pop music'
-        }
-    
+    ('vietnamese',
+     (('vietnamese', 'vietnam music', 'vpop', 'vietnamese song'),),
+     ('vietnamese music', 'vpop', 'vietnam pop', 'vietnamese songs', 'son tung mtp',
+      'duc phuc', 'erik vietnam', 'chi pu', 'vietnamese ballad', 'vietnamese rap',
+      'vietnamese indie', 'vietnamese folk', 'vietnamese modern', 'ho chi minh music'),
+     'Vietnamese and V-pop music'),
+
     # Thai music
-    elif any(word in message_lower for word in ['thai', 'thailand music', 'thai song', 'thai pop']):
-        return {
-            'type': 'thai',
-            'search_terms': [
-                'thai music', 'thai pop', 'thailand songs', 'thai ballad',
-                'bodyslam', 'potato', 'clash', 'silly fools', 'big ass',
-                'thai indie', 'thai rock', 'thai hip hop', 'thai folk',
-                'luk thung', 'mor lam', 'thai country', 'bangkok music'
-            ],
-            'genre_hint': 'Thai music and T-pop'
-        }
-    
+    ('thai',
+     (('thai', 'thailand music', 'thai song', 'thai pop'),),
+     ('thai music', 'thai pop', 'thailand songs', 'thai ballad', 'bodyslam', 'potato',
+      'clash', 'silly fools', 'big ass', 'thai indie', 'thai rock', 'thai hip hop',
+      'thai folk', 'luk thung', 'mor lam', 'thai country', 'bangkok music'),
+     'Thai music and T-pop'),
+
     # Arabic and Middle Eastern music
-    elif any(word in message_lower for word in ['arabic', 'middle eastern', 'arabic music', 'arab music', 'lebanese', 'egyptian music']):
-        return {
-            'type': 'arabic',
-            'search_terms': [
-                'arabic music', 'middle eastern music', 'arab songs',
-                'fairuz', 'amr diab', 'nancy ajram', 'elissa', 'tamer hosny',
-                'arabic pop', 'arabic classical', 'oud music', 'arabic ballad',
-                'egyptian music', 'lebanese music', 'iraqi music', 'syrian music',
-                'arabic rap', 'arabic folk', 'traditional arabic'
-            ],
-            'genre_hint': 'Arabic and Middle Eastern music'
-        }
-    
+    ('arabic',
+     (('arabic', 'middle eastern', 'arabic music', 'arab music', 'lebanese',
+       'egyptian music'),),
+     ('arabic music', 'middle eastern music', 'arab songs', 'fairuz', 'amr diab',
+      'nancy ajram', 'elissa', 'tamer hosny', 'arabic pop', 'arabic classical', 'oud music',
+      'arabic ballad', 'egyptian music', 'lebanese music', 'iraqi music', 'syrian music',
+      'arabic rap', 'arabic folk', 'traditional arabic'),
+     'Arabic and Middle Eastern music'),
+
     # Indonesian music
-    elif any(word in message_lower for word in ['indonesian', 'indonesia music', 'indo music', 'indonesian song']):
-        return {
-            'type': 'indonesian',
-            'search_terms': [
-                'indonesian music', 'indo pop', 'indonesia songs',
-                'raisa', 'isyana sarasvati', 'afgan', 'glenn fredly',
-                'indonesian indie', 'indonesian rock', 'dangdut',
-                'indonesian folk', 'jakarta music', 'indonesian ballad'
-            ],
-            'genre_hint': 'Indonesian music and Indo-pop'
-        }
-    
+    ('indonesian',
+     (('indonesian', 'indonesia music', 'indo music', 'indonesian song'),),
+     ('indonesian music', 'indo pop', 'indonesia songs', 'raisa', 'isyana sarasvati',
+      'afgan', 'glenn fredly', 'indonesian indie', 'indonesian rock', 'dangdut',
+      'indonesian folk', 'jakarta music', 'indonesian ballad'),
+     'Indonesian music and Indo-pop'),
+
     # Nordic music
-    elif any(word in message_lower for word in ['finnish', 'finland music', 'nordic music', 'scandinavian music']):
-        return {
-            'type': 'nordic',
-            'search_terms': [
-                'finnish music', 'nordic music', 'scandinavian music',
-                'sunrise avenue', 'nightwish', 'him band', 'children of bodom',
-                'finnish rock', 'nordic folk', 'finnish metal', 'nordic pop',
-                'icelandic music', 'norwegian music', 'danish music', 'swedish indie'
-            ],
-            'genre_hint': 'Finnish and Nordic music'
-        }
-    
+    ('nordic',
+     (('finnish', 'finland music', 'nordic music', 'scandinavian music'),),
+     ('finnish music', 'nordic music', 'scandinavian music', 'sunrise avenue', 'nightwish',
+      'him band', 'children of bodom', 'finnish rock', 'nordic folk', 'finnish metal',
+      'nordic pop', 'icelandic music', 'norwegian music', 'danish music', 'swedish indie'),
+     'Finnish and Nordic music'),
+
     # Mexican music
-    elif any(word in message_lower for word in ['mexican', 'mexico music', 'mariachi', 'banda', 'ranchera']):
-        return {
-            'type': 'mexican',
-            'search_terms': [
-                'mexican music', 'mariachi', 'banda music', 'ranchera',
-                'vicente fernandez', 'juan gabriel', 'alejandro fernandez',
-                'mexican folk', 'regional mexican', 'norteño', 'corridos',
-                'mexican pop', 'mexican rock', 'mexican indie', 'mexico traditional'
-            ],
-            'genre_hint': 'Mexican and Regional Mexican music'
-        }
-    
+    ('mexican',
+     (('mexican', 'mexico music', 'mariachi', 'banda', 'ranchera'),),
+     ('mexican music', 'mariachi', 'banda music', 'ranchera', 'vicente fernandez',
+      'juan gabriel', 'alejandro fernandez', 'mexican folk', 'regional mexican', 'norteño',
+      'corridos', 'mexican pop', 'mexican rock', 'mexican indie', 'mexico traditional'),
+     'Mexican and Regional Mexican music'),
+
     # Russian and Eastern European music
-    elif any(word in message_lower for word in ['russian', 'russia music', 'eastern european', 'slavic music']):
-        return {
-            'type': 'russian',
-            'search_terms': [
-                'russian music', 'russian pop', 'russian rock',
-                'russian folk', 'eastern european music', 'slavic music',
-                'russian ballad', 'russian indie', 'soviet music',
-                'ukrainian music', 'polish music', 'czech music'
-            ],
-            'genre_hint': 'Russian and Eastern European music'
-        }
+    ('russian',
+     (('russian', 'russia music', 'eastern european', 'slavic music'),),
+     ('russian music', 'russian pop', 'russian rock', 'russian folk',
+      'eastern european music', 'slavic music', 'russian ballad', 'russian indie',
+      'soviet music', 'ukrainian music', 'polish music', 'czech music'),
+     'Russian and Eastern European music'),
+]
+
+# Default case for general music requests
+GENERAL_CATEGORY = Category(
+    type='general',
+    search_terms=(
+        'popular music', 'trending songs', 'chart hits', 'radio hits', 'viral songs',
+        'new releases', 'indie hits', 'underground hits', 'international hits',
+        'crossover hits', 'breakthrough artists', 'emerging artists', 'hidden gems',
+        'cult classics', 'fan favorites'
+    ),
+    genre_hint='diverse popular music from around the world'
+)
+
+# Payloads are built once at import and shared by every classification
+PAYLOADS = {
+    key: Category(type=key, search_terms=search_terms, genre_hint=genre_hint)
+    for key, _, search_terms, genre_hint in CATEGORIES
+}
+PAYLOADS['general'] = GENERAL_CATEGORY
+
+CATEGORY_RULES = tuple((trigger_groups, PAYLOADS[key]) for key, trigger_groups, _, _ in CATEGORIES)
+
+def classify_genre_request(message_lower):
+    """
+    Classify a lowercased message into a genre/mood category
+    Returns Category with request type, search terms, and genre hint
+    """
+    for trigger_groups, payload in CATEGORY_RULES:
+        if all(any(trigger in message_lower for trigger in group) for group in trigger_groups):
+            return payload
     
-    # Default case for general music requests
-    else:
-        return {
-            'type': 'general',
-            'search_terms': [
-                'popular music', 'trending songs', 'chart hits', 'radio hits',
-                'viral songs', 'new releases', 'indie hits', 'underground hits',
-                'international hits', 'crossover hits', 'breakthrough artists',
-                'emerging artists', 'hidden gems', 'cult classics', 'fan favorites'
-            ],
-            'genre_hint': 'diverse popular music from around the world'
-        }
+    return GENERAL_CATEGORY
+
+# Single-word triggers resolved ahead of the category table. Each payload is the
+# table's own answer for that token, so priority between categories is preserved
+FAST_PATH_TOKENS = tuple(dict.fromkeys(
+    trigger
+    for _, trigger_groups, _, _ in CATEGORIES
+    for group in trigger_groups
+    for trigger in group
+    if ' ' not in trigger
+))
+EXACT_TOKEN_TO_CATEGORY = {token: classify_genre_request(token) for token in FAST_PATH_TOKENS}
 
 def generate_ai_response(user_message, user_request, available_songs, suggested_songs):
     """
@@ -1146,105 +1126,50 @@ def generate_ai_response(user_message, user_request, available_songs, suggested_
     
     # Prepare song list for AI context
     if available_songs:
-        songs_list = "\n".join([f"- {song}" for song in available_songs[:20]])
+        songs_list = "\n".join(f"- {song}" for song in islice(available_songs, 20))
     else:
         songs_list = "No matching songs found in database"
     
     # Create memory exclusion context for AI
-    exclusion_text = ""
-    if suggested_songs:
-        exclusion_text = f"""
-
-🚨🚨🚨 CRITICAL MEMORY RULE - ABSOLUTELY NEVER suggest these songs (already suggested):
-{chr(10).join([f"❌ {song}" for song in suggested_songs])}
-
-⚠️ IF YOU SUGGEST ANY OF THE ABOVE SONGS, THE SYSTEM WILL BREAK!
-✅ YOU MUST suggest a COMPLETELY DIFFERENT song from the available list above!
-🔄 Memory check: {len(suggested_songs)} songs already suggested - pick something NEW!"""
+    exclusion_text = build_exclusion_text(suggested_songs)
 
     # Handle specific song requests
-    if user_request['type'] == 'specific_song':
-        song_name = user_request['song_name']
-        artist_name = user_request['artist_name']
-        prompt = f"""You are YAIN! The user wants "{song_name}" by {artist_name}.
-    
-        Respond excitedly and suggest exactly: Try '{song_name}' by {artist_name}
-    
-        Your response:"""
+    if user_request.type == 'specific_song':
+        prompt = SPECIFIC_TEMPLATE.format(
+            song_name=user_request.song_name,
+            artist_name=user_request.artist_name
+        )
     
     # Handle artist-specific requests
-    elif user_request['type'] == 'artist_search':
-        artist_name = user_request['artist_name']
-        artist_id = user_request.get('artist_id')  # May be provided by dynamic detection
-        prompt = f"""You are YAIN! The user wants songs by {artist_name}.
-    
-        Available songs by {artist_name}:
-        {songs_list}
-    
-        Pick ONE song from the list above and be excited about {artist_name}!
-        Format: Try 'Song Name' by Artist Name
-        
-        {exclusion_text}
-    
-        Your response:"""
+    elif user_request.type == 'artist_search':
+        prompt = ARTIST_TEMPLATE.format(
+            artist_name=user_request.artist_name,
+            songs_list=songs_list,
+            exclusion_text=exclusion_text
+        )
     
     # Handle general mood/genre requests
     else:
-        prompt = f"""
-You are YAIN, a cheeky, witty music chatbot with personality! You're like that friend who always knows the perfect song and loves to chat.
-
-User said: "{user_message}"
-
-Your response should:
-1. First, respond to what they said in a clever, funny, or encouraging way (like a friend would)
-2. Reference a song theme naturally in your conversation 
-3. Then suggest that specific song with "Try 'Song Name' by Artist Name"
-5. Be funny and nice, but not too long - keep it engaging!
-6. Keep it SHORT: Only 3-5 sentences MAX
-
-
-CREATIVE FREEDOM RULES:
-- Come up with your OWN witty responses (no copying examples!)
-- Be spontaneous and authentic to the moment
-- Use natural humor that fits the situation
-- Make each response feel fresh and unique
-- Show personality through your word choice and energy
-- React genuinely to what they're telling you
-- Keep it SHORT: Only 3-5 sentences MAX
-
-WHAT THEY WANT: {user_request['genre_hint']}
-
-AVAILABLE SONGS FOR THIS REQUEST:
-{songs_list}
-{exclusion_text}
-
-INSTRUCTIONS:
-- Be conversational and friendly first, then suggest music
-- Use emojis naturally (not excessively) 
-- React to their mood genuinely
-- Pick ONE song from the available list above
-- Format as: "Try 'Song Name' by Artist Name"
-- ⚠️ NEVER EVER repeat songs from the exclusion list above
-- 🧠 MEMORY: You have suggested {len(suggested_songs)} songs before - pick something COMPLETELY different!
-- Keep it engaging but not too long
-
-🔄 MEMORY CHECK: Avoid all {len(suggested_songs)} previously suggested songs above!
-
-Your conversational response (chat first, then suggest song):
-"""
+        prompt = GENERAL_TEMPLATE.format(
+            user_message=user_message,
+            genre_hint=user_request.genre_hint,
+            songs_list=songs_list,
+            exclusion_text=exclusion_text,
+            suggested_count=len(suggested_songs)
+        )
     
     try:
-        print("🤖 Sending CREATIVE prompt to AI...")
+        logger.debug("Sending creative prompt to AI")
         response = model.generate_content(prompt)
         ai_text = response.text
-        print(f"✅ CREATIVE AI Response: {ai_text}")
+        logger.debug("Creative AI response: %s", ai_text)
         return ai_text
     except Exception as e:
-        print(f"⚠️ AI Rate Limited or Failed: {e}")
+        logger.warning("AI rate limited or failed: %s", e)
         
         # Handle AI failure with appropriate fallbacks
-        if user_request['type'] == 'artist_search':
-            artist_name = user_request['artist_name']
+        if user_request.type == 'artist_search':
+            artist_name = user_request.artist_name
             if available_songs:
                 return get_creative_fallback_response(user_request, available_songs).replace("Try", f"Okay {artist_name} fan, try")
             else:
@@ -1254,8 +1179,7 @@ Your conversational response (chat first, then suggest song):
                     f"We stan {artist_name}! But my database chose violence today. Hit up Spotify for the goods!",
                     f"{artist_name} supremacy! My database is being messy though - try Spotify for their latest!"
                 ]
-                import random
-                return random.choice(artist_responses)
+                return _RNG.choice(artist_responses)
         
         # Use creative fallback for other request types
         return get_creative_fallback_response(user_request, available_songs)
@@ -1265,7 +1189,12 @@ def extract_song_from_response(ai_text):
     Extract song name and artist from AI response text using regex patterns
     Returns formatted string like "'Song Name' by Artist Name" or None if not found
     """
-    print(f"🔍 Extracting song from: {ai_text}")
+    logger.debug("Extracting song from: %s", ai_text)
+    
+    # Every pattern below needs a literal " by " - skip the regex work when it's absent
+    if ' by ' not in ai_text.lower():
+        logger.debug("No song extracted from AI response")
+        return None
     
     # Regex patterns to match different song suggestion formats
     patterns = [
@@ -1333,18 +1262,18 @@ def extract_song_from_response(ai_text):
                     artist_name = ' '.join(words[:2])  # Take first 2 words otherwise
             
             # Remove any remaining emojis and regional flag characters
-            artist_name = re.sub(r'[🎵🎶🇯🇲🔥💯⚡🇧🇩🇮🇳🌍🇰🇷🇺🇸🇲🇽🇧🇷🇰🇪]', '', artist_name)  # Remove emojis
+            artist_name = artist_name.translate(_EMOJI_DELETE_TABLE)  # Remove emojis
             artist_name = artist_name.strip()
             
             # Validate that we have both song and artist
             if song_name and artist_name and len(artist_name) > 0:
                 extracted = f"'{song_name}' by {artist_name}"
-                print(f"✅ Extracted (pattern {i+1}): {extracted}")
+                logger.debug("Extracted (pattern %d): %s", i + 1, extracted)
                 return extracted
             else:
-                print(f"⚠️ Invalid extraction: song='{song_name}' artist='{artist_name}'")
+                logger.debug("Invalid extraction: song='%s' artist='%s'", song_name, artist_name)
     
-    print("❌ No song extracted from AI response")
+    logger.debug("No song extracted from AI response")
     return None
 
 def generate_ai_response_personalized(user_message, user_request, available_songs, suggested_songs, user_data):
@@ -1358,173 +1287,125 @@ def generate_ai_response_personalized(user_message, user_request, available_song
     
     # Fallback to general response if no preferences available
     if not preferences:
-        print(f"❌ No preferences found in user_data")
+        logger.warning("No preferences found in user_data")
         return generate_ai_response(user_message, user_request, available_songs, suggested_songs)
     
     top_genres = preferences.get('top_genres', [])[:5]
     favorite_artists = preferences.get('favorite_artists', [])[:5]
     display_name = profile.get('display_name', 'music lover')
+    user_context = _user_prompt_context(tuple(top_genres), tuple(favorite_artists))
     
     # Prepare song list for AI context
     if available_songs:
-        songs_list = "\n".join([f"- {song}" for song in available_songs[:20]])
+        songs_list = "\n".join(f"- {song}" for song in islice(available_songs, 20))
     else:
         songs_list = "No matching songs found in database"
     
     # Create memory exclusion context for AI
-    exclusion_text = ""
-    if suggested_songs:
-        exclusion_text = f"""
-
-🚨🚨🚨 CRITICAL MEMORY RULE - ABSOLUTELY NEVER suggest these songs (already suggested):
-{chr(10).join([f"❌ {song}" for song in suggested_songs])}
-
-⚠️ IF YOU SUGGEST ANY OF THE ABOVE SONGS, THE SYSTEM WILL BREAK!
-✅ YOU MUST suggest a COMPLETELY DIFFERENT song from the available list above!
-🔄 Memory check: {len(suggested_songs)} songs already suggested - pick something NEW!"""
+    exclusion_text = build_exclusion_text(suggested_songs)
 
     # Handle profile information requests
-    if user_request['type'] == 'profile_request':
-        prompt = f"""You are YAIN! The user is asking about their profile.
-
-USER PROFILE:
-Name: {display_name}
-Top Genres: {', '.join(top_genres[:3]) if top_genres else 'Still analyzing'}
-Favorite Artists: {', '.join(favorite_artists[:3]) if favorite_artists else 'Still analyzing'}
-
-Respond with their name and music taste in a fun way!
-
-Your response:"""
+    if user_request.type == 'profile_request':
+        prompt = PROFILE_TEMPLATE.format(
+            display_name=display_name,
+            top_genres=user_context.genres_top3 or 'Still analyzing',
+            favorite_artists=user_context.artists_top3 or 'Still analyzing'
+        )
     
     # Handle regular requests with personalization
     else:
-        prompt = f"""
-You are YAIN, a nice and sassy music chatbot with a funny personality! You're that supportive friend who playfully teases but always has your back. You're witty, charming, and genuinely funny - never mean or hurtful.
-
-User said: "{user_message}"
-
-🎯 YOUR PERSONALITY CORE:
-- You're naturally funny, sassy, and supportive 
-- You create your OWN jokes and comebacks (be original!)
-- You read the room and match their energy
-- You're confident in your music taste
-- You make people laugh while giving them exactly what they need
-- You're like a cool friend who happens to be a music genius
-
-
-🎵 Their music taste (use SUBTLY when relevant):
-- Top genres: {', '.join(top_genres[:3]) if top_genres else 'Still analyzing...'}
-- Favorite artists: {', '.join(favorite_artists[:3]) if favorite_artists else 'Still analyzing...'}
-
-WHAT THEY WANT: {user_request['genre_hint']}
-
-AVAILABLE SONGS FOR THIS REQUEST:
-{songs_list}
-{exclusion_text}
-
-🔥 YOUR MISSION:
-1. React to what they said in your own unique way (no templates, be yourself!)
-2. Show you understand their vibe 
-3. Build up the anticipation for your song choice
-4. Suggest ONE song from the available list: "Try 'Song Name' by Artist Name"
-5. Be funny and nice, but not too long - keep it engaging!
-6. Keep it SHORT: Only 3-5 sentences MAX
-
-
-CREATIVE FREEDOM RULES:
-- Come up with your OWN witty responses (no copying examples!)
-- Be spontaneous and authentic to the moment
-- Use natural humor that fits the situation
-- Make each response feel fresh and unique
-- Show personality through your word choice and energy
-- React genuinely to what they're telling you
-- Keep it SHORT: Only 3-5 sentences MAX
-
-
-
-🧠 MEMORY: You've suggested {len(suggested_songs)} songs before - pick something COMPLETELY different!
-
-Be yourself, be funny, be sassy, and absolutely nail this recommendation:
-"""
+        prompt = PERSONALIZED_TEMPLATE.format(
+            user_message=user_message,
+            top_genres=user_context.genres_top3 or 'Still analyzing...',
+            favorite_artists=user_context.artists_top3 or 'Still analyzing...',
+            genre_hint=user_request.genre_hint,
+            songs_list=songs_list,
+            exclusion_text=exclusion_text,
+            suggested_count=len(suggested_songs)
+        )
     
     try:
-        print("🤖 Sending CREATIVE PERSONALIZED prompt to AI...")
+        logger.debug("Sending creative personalized prompt to AI")
         response = model.generate_content(prompt)
         ai_text = response.text
-        print(f"✅ CREATIVE PERSONALIZED AI Response: {ai_text}")
+        logger.debug("Creative personalized AI response: %s", ai_text)
         return ai_text
     except Exception as e:
-        print(f"⚠️ Personalized AI failed, using creative fallback: {e}")
+        logger.warning("Personalized AI failed, using creative fallback: %s", e)
         
         # Handle profile requests with fallback responses
-        if user_request['type'] == 'profile_request':
+        if user_request.type == 'profile_request':
             profile_responses = [
-                f"Hey {display_name}! Your Spotify tells me you're into {', '.join(top_genres[:3]) if top_genres else 'amazing music'} and you clearly have taste since you love {', '.join(favorite_artists[:2]) if favorite_artists else 'great artists'}! Your music personality is *chef's kiss* 🎵",
-                f"Listen {display_name}, I've been analyzing your taste and WOW! {', '.join(top_genres[:2]) if top_genres else 'Your genres'} plus {', '.join(favorite_artists[:2]) if favorite_artists else 'your artists'}? Immaculate vibes only! ✨",
-                f"Okay {display_name}, based on your Spotify I can tell you're cultured! {', '.join(top_genres[:2]) if top_genres else 'Your music taste'} and {', '.join(favorite_artists[:2]) if favorite_artists else 'those artists'} prove you've got main character energy! 💅"
+                f"Hey {display_name}! Your Spotify tells me you're into {user_context.genres_top3 or 'amazing music'} and you clearly have taste since you love {user_context.artists_top2 or 'great artists'}! Your music personality is *chef's kiss* 🎵",
+                f"Listen {display_name}, I've been analyzing your taste and WOW! {user_context.genres_top2 or 'Your genres'} plus {user_context.artists_top2 or 'your artists'}? Immaculate vibes only! ✨",
+                f"Okay {display_name}, based on your Spotify I can tell you're cultured! {user_context.genres_top2 or 'Your music taste'} and {user_context.artists_top2 or 'those artists'} prove you've got main character energy! 💅"
             ]
-            import random
-            return random.choice(profile_responses)
+            return _RNG.choice(profile_responses)
         elif available_songs:
+            if not isinstance(available_songs, (list, tuple)):
+                available_songs = tuple(available_songs)
+            
             # Use creative fallback with personalization
             response = get_creative_fallback_response(user_request, available_songs, display_name)
             
             # Add personalized touch if user's taste matches available songs
             if top_genres and available_songs:
-                import random
-                song = random.choice(available_songs)
-                if any(genre.lower() in song.lower() for genre in top_genres[:3]):
+                song = available_songs[_RNG.randrange(len(available_songs))]
+                song_lower = song.lower()
+                if any(genre in song_lower for genre in user_context.genres_lower):
+                    first_genre = user_context.first_genre
                     personal_touches = [
-                        f"This is SO your vibe based on your {top_genres[0]} obsession!",
-                        f"I see your {top_genres[0]} taste and I'm here for it!",
-                        f"Your {top_genres[0]} era is showing and I LOVE it!"
+                        f"This is SO your vibe based on your {first_genre} obsession!",
+                        f"I see your {first_genre} taste and I'm here for it!",
+                        f"Your {first_genre} era is showing and I LOVE it!"
                     ]
-                    return f"OH {display_name}! {random.choice(personal_touches)} {song}"
+                    return f"OH {display_name}! {_RNG.choice(personal_touches)} {song}"
             
             return response
         else:
             # No songs available fallback
             return get_creative_fallback_response(user_request, [], display_name)
         
+# Fallback phrase pools - built once, picked from when the AI call fails
+FALLBACK_OPENERS = (
+    "Okay bestie,", "Listen up,", "Alright alright,", "Oh honey,", 
+    "You know what?", "Here's the tea:", "Plot twist:", "Real talk:",
+    "Not to be dramatic but", "I'm about to change your life:",
+    "Your playlist is about to thank me:", "This is your moment:"
+)
+
+FALLBACK_CONFIDENCE = (
+    "this is about to be PERFECT", "you're gonna obsess over this",
+    "this one hits different", "absolute chef's kiss vibes",
+    "this is THE one", "trust me on this", "you'll thank me later",
+    "this is your new anthem", "prepare to be blessed",
+    "this is going straight to your favorites"
+)
+
+FALLBACK_SONG_INTROS = (
+    "Try", "Give", "Check out", "Listen to", "Go with", 
+    "Your ears need", "Time for", "Here's", "Meet your new obsession:",
+    "Introducing", "Say hello to", "Ready for"
+)
+
 def get_creative_fallback_response(user_request, available_songs, display_name=None):
     """
     Generate creative, varied fallback responses when AI fails
     Maintains personality and provides appropriate song suggestions
     """
-    import random
-    
-    # Random conversation starters
-    openers = [
-        "Okay bestie,", "Listen up,", "Alright alright,", "Oh honey,", 
-        "You know what?", "Here's the tea:", "Plot twist:", "Real talk:",
-        "Not to be dramatic but", "I'm about to change your life:",
-        "Your playlist is about to thank me:", "This is your moment:"
-    ]
-    
-    # Random confidence boosters
-    confidence = [
-        "this is about to be PERFECT", "you're gonna obsess over this",
-        "this one hits different", "absolute chef's kiss vibes",
-        "this is THE one", "trust me on this", "you'll thank me later",
-        "this is your new anthem", "prepare to be blessed",
-        "this is going straight to your favorites"
-    ]
-    
-    # Random song introduction phrases
-    song_intros = [
-        "Try", "Give", "Check out", "Listen to", "Go with", 
-        "Your ears need", "Time for", "Here's", "Meet your new obsession:",
-        "Introducing", "Say hello to", "Ready for"
-    ]
-    
-    if available_songs:
-        random_song = random.choice(available_songs)
-        opener = random.choice(openers)
-        boost = random.choice(confidence)
-        intro = random.choice(song_intros)
+    # Materialize once so the pick below can index directly
+    if available_songs and not isinstance(available_songs, (list, tuple)):
+        available_songs = tuple(available_songs)
+    
+    song_count = len(available_songs) if available_songs else 0
+    if song_count:
+        random_song = available_songs[_RNG.randrange(song_count)]
+        opener = _RNG.choice(FALLBACK_OPENERS)
+        boost = _RNG.choice(FALLBACK_CONFIDENCE)
+        intro = _RNG.choice(FALLBACK_SONG_INTROS)
         
         # Add personalized name occasionally
-        if display_name and random.choice([True, False]):
+        if display_name and _RNG.choice([True, False]):
             opener = f"{opener} {display_name},"
         
         return f"{opener} {boost}! {intro} {random_song}"
@@ -1538,15 +1419,13 @@ def get_creative_fallback_response(user_request, available_songs, display_name=N
         "My database said 'not today' but your music taste said 'ALWAYS'! Go stream 'Bad Habit' by Steve Lacy while I handle business! 🎵"
     ]
     
-    return random.choice(no_songs_responses)
+    return _RNG.choice(no_songs_responses)
 
 def get_genre_reaction(genre_type):
     """
     Get a creative reaction with personality based on genre type
     Returns appropriate response for different music genres
     """
-    import random
-    
     reactions = {
         'bengali': [
             "Bengali music hits different! 🇧🇩 This one's about to transport you:",
@@ -1581,7 +1460,7 @@ def get_genre_reaction(genre_type):
     }
     
     if genre_type in reactions:
-        return random.choice(reactions[genre_type])
+        return _RNG.choice(reactions[genre_type])
     
     # Default creative reactions for unlisted genres
     default_reactions = [
@@ -1592,4 +1471,4 @@ def get_genre_reaction(genre_type):
         "Plot twist: this song is about to become your personality:"
     ]
     
-    return random.choice(default_reactions)
\ No newline at end of file
+    return _RNG.choice(default_reactions)
\ No newline at end of file
@@ -0,0 +1,163 @@
+# ------------------------------------------------------------
+# © 2025 Samia Islam. All rights reserved.
+# This file is part of the "YAIN" project.
+# Released under CC BY-NC 4.0 license.
+# For demo and educational use only — not for commercial use.
+# ------------------------------------------------------------
+
+# Shared caching helpers
+# In-memory and persistent TTL caches used by the Spotify and YouTube services
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for "no cached value", so None can be cached as a real result
+MISSING = object()
+
+class TTLCache:
+    """
+    Size-capped LRU cache whose entries expire after a fixed time-to-live
+
+    Args:
+        maxsize (int): Maximum number of entries kept before evicting the oldest
+        ttl (float): Seconds an entry stays valid after being stored
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, MISSING)
+            if entry is MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def remaining_ttl(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return 0
+            return max(0.0, entry[1] - time.monotonic())
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class SQLiteTTLStore:
+    """
+    Persistent key/value store with per-entry expiry backed by a single SQLite file
+
+    Args:
+        path (str): Database file path
+        max_entries (int): Row cap enforced when pruning
+        prune_every (int): Number of writes between prune passes
+    """
+
+    def __init__(self, path, max_entries, prune_every=500):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._conn = None
+        self._disabled = False
+        self._writes = 0
+        self._lock = Lock()
+
+    def _connection(self):
+        if self._conn is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                conn.commit()
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Disabling persistent cache %s: %s", self.path, e)
+                self._disabled = True
+        return self._conn
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: (value, remaining_ttl) or (MISSING, 0) if absent or expired
+        """
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return MISSING, 0
+            try:
+                row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Persistent cache read failed: %s", e)
+                return MISSING, 0
+        if row is None:
+            return MISSING, 0
+        remaining_ttl = row[1] - time.time()
+        if remaining_ttl <= 0:
+            return MISSING, 0
+        return json.loads(row[0]), remaining_ttl
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time() + ttl)
+                )
+                self._writes += 1
+                if self._writes % self.prune_every == 0:
+                    self._prune(conn)
+                conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning("Persistent cache write failed: %s", e)
+
+    def _prune(self, conn):
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM entries WHERE key IN "
+            "(SELECT key FROM entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+__all__ = [
+    'MISSING',
+    'TTLCache',
+    'SQLiteTTLStore'
+]
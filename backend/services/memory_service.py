@@ -8,8 +8,27 @@
 # Memory management system for music suggestions
 # Prevents song repetition and tracks user interaction history
 
+import logging
 import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 
+logger = logging.getLogger(__name__)
+
+# Quote characters deleted from titles before comparison
+_QUOTE_DELETE_TABLE = dict.fromkeys(map(ord, "'\""), None)
+
+# Single scan for both song formats: the quoted 'Song' by Artist form (groups 1-2)
+# takes priority over the bare Song by Artist form (groups 3-4), as the old
+# two-pattern loop did
+_SONG_RE = re.compile(
+    r"""^(?:[\s\S]*?['"]([^'"]+)['"] by (.+)|[\s\S]*?([^'"]+) by (.+))""",
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=4096)
 def normalize_song_title(song):
     """
     Normalize song title string for consistent comparison
@@ -20,12 +39,12 @@ def normalize_song_title(song):
     Returns:
         str: Normalized lowercase string without quotes and extra spaces
     """
-    # Strip quotes and punctuation for comparison
-    normalized = re.sub(r"['\"]", "", song.lower())
-    # Normalize whitespace to single spaces
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
-    return normalized
+    # Compose accents (NFC) so "Beyoncé" matches whether it arrived precomposed or decomposed
+    song = unicodedata.normalize('NFC', song)
+    # Strip quotes, then split/join to collapse and trim whitespace in the same pass
+    return ' '.join(song.lower().translate(_QUOTE_DELETE_TABLE).split())
 
+@lru_cache(maxsize=4096)
 def extract_song_parts(song):
     """
     Parse song string to extract song name and artist components
@@ -36,117 +55,216 @@ def extract_song_parts(song):
     Returns:
         tuple: (song_name, artist_name) both in lowercase, or (song, "") if no match
     """
-    # Define regex patterns for common song formats
-    patterns = [
-        r"['\"]([^'\"]+)['\"] by (.+)",  # 'Song' by Artist format
-        r"([^'\"]+) by (.+)",           # Song by Artist format
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, song, re.IGNORECASE)
-        if match:
-            song_name = match.group(1).strip()
-            artist_name = match.group(2).strip()
-            return song_name.lower(), artist_name.lower()
+    # Same NFC composition as normalize_song_title so parsed names compare consistently
+    song = unicodedata.normalize('NFC', song)
+    match = _SONG_RE.match(song)
+    if match:
+        if match.group(1) is not None:
+            song_name, artist_name = match.group(1, 2)
+        else:
+            song_name, artist_name = match.group(3, 4)
+        return song_name.strip().lower(), artist_name.strip().lower()
     
     # Return whole string as song name if no pattern matches
     return song.lower(), ""
 
+# Joins remembered song names into one searchable string; never appears in titles
+_NAME_SEPARATOR = "\x00"
+
+@lru_cache(maxsize=4096)
+def _name_tokens(song_name):
+    """Word set of a parsed song name, shared across comparisons"""
+    return frozenset(song_name.split())
+
+@dataclass(slots=True)
+class MemoryStore:
+    """
+    Suggested-song memory with its match indexes kept alongside the list
+    Every index is updated on add, so readers never re-parse the whole memory
+    """
+    songs: list = field(default_factory=list)
+    seen: set = field(default_factory=set)
+    normalized: set = field(default_factory=set)
+    named_suggestions: list = field(default_factory=list)
+    by_artist: dict = field(default_factory=lambda: defaultdict(list))
+    name_index: dict = field(default_factory=dict)
+    names_blob: str = ""
+    
+    @classmethod
+    def from_songs(cls, songs):
+        """Build a store from a plain list of songs, skipping repeats"""
+        store = cls()
+        for song in songs:
+            store.add(song)
+        return store
+    
+    def add(self, song):
+        """
+        Add a song and update every index in O(1)
+        
+        Args:
+            song (str): Song to remember
+            
+        Returns:
+            bool: True if the song was new, False if it was already remembered
+        """
+        if song in self.seen:
+            return False
+        self.seen.add(song)
+        self.songs.append(song)
+        self.normalized.add(normalize_song_title(song))
+        
+        song_name, artist_name = extract_song_parts(song)
+        if song_name:
+            suggested = {
+                'original': song,
+                'song_name': song_name,
+                'artist_name': artist_name,
+                'tokens': _name_tokens(song_name)
+            }
+            self.named_suggestions.append(suggested)
+            self.name_index.setdefault(song_name, song)
+            self.names_blob += _NAME_SEPARATOR + song_name
+            # Artist buckets so same-artist checks skip the pairwise scan
+            if artist_name:
+                self.by_artist[artist_name].append(suggested)
+        return True
+    
+    def trim(self, max_size):
+        """
+        Drop the oldest songs in place so at most max_size remain
+        
+        The indexes are rebuilt from the kept songs on this same object, so
+        every reference to the store sees the trimmed memory.
+        
+        Args:
+            max_size (int): Maximum number of songs to keep
+            
+        Returns:
+            int: Number of songs dropped
+        """
+        drop_count = len(self.songs) - max_size
+        if drop_count <= 0:
+            return 0
+        trimmed = MemoryStore.from_songs(self.songs[drop_count:])
+        for store_field in fields(self):
+            setattr(self, store_field.name, getattr(trimmed, store_field.name))
+        return drop_count
+    
+    def __len__(self):
+        return len(self.songs)
+    
+    def __iter__(self):
+        return iter(self.songs)
+    
+    def __contains__(self, song):
+        # Set-backed, so `song in store` never scans the list
+        return song in self.seen
+
+@lru_cache(maxsize=32)
+def _memory_store_for(songs_key):
+    """Index a memory snapshot once - a request filters and validates against the same list"""
+    return MemoryStore.from_songs(songs_key)
+
+def _as_memory_store(suggested_songs):
+    """Accept either a MemoryStore or a plain song list (indexed once per distinct snapshot)"""
+    if isinstance(suggested_songs, MemoryStore):
+        return suggested_songs
+    return _memory_store_for(tuple(suggested_songs))
+
+def _find_fuzzy_match(song, memory):
+    """
+    Match a song against memory by song name and by same-artist word overlap
+    
+    Args:
+        song (str): Song to check
+        memory (MemoryStore): Indexed memory contents
+        
+    Returns:
+        tuple: (strategy, matched suggestion) or None if the song is new
+    """
+    song_name, artist_name = extract_song_parts(song)
+    if not song_name:
+        return None
+    
+    # Strategy 2: Song name substring match
+    # One scan of the joined names tells whether this name sits inside any remembered
+    # name, so the per-entry loop only repeats that check when it can succeed
+    inside_remembered = _NAME_SEPARATOR in song_name or song_name in memory.names_blob
+    for suggested in memory.named_suggestions:
+        remembered_name = suggested['song_name']
+        if remembered_name in song_name or (inside_remembered and song_name in remembered_name):
+            return 'song name', suggested['original']
+    
+    # Strategy 3: Same artist with similar song names
+    if artist_name:
+        song_words = _name_tokens(song_name)
+        for suggested in memory.by_artist.get(artist_name, ()):
+            # At least one common word between song names
+            if not song_words.isdisjoint(suggested['tokens']):
+                return 'same artist, similar song', suggested['original']
+    
+    return None
+
+def _is_fuzzy_duplicate(song, memory):
+    """Predicate form of _find_fuzzy_match that logs the blocking match"""
+    match = _find_fuzzy_match(song, memory)
+    if match:
+        logger.debug("Blocked (%s): %s matches %s", match[0], song, match[1])
+        return True
+    return False
+
 def filter_trending_songs(trending_songs, suggested_songs):
     """
     Remove previously suggested songs from trending list using multiple matching strategies
     
     Args:
         trending_songs (list): Available songs to filter
-        suggested_songs (list): Previously suggested songs to exclude
+        suggested_songs (list or MemoryStore): Previously suggested songs to exclude
         
     Returns:
         list: Filtered songs with duplicates removed
     """
     
-    # Log filtering process for debugging
-    print(f"\n=== MEMORY FILTER DEBUG ===")
-    print(f"Input: {len(trending_songs)} trending songs")
-    print(f"Memory: {len(suggested_songs)} suggested songs")
+    # Log filtering process for debugging (arguments are only formatted when DEBUG is enabled)
+    logger.debug("Memory filter input: %d trending songs, %d suggested songs", len(trending_songs), len(suggested_songs))
     
     if not suggested_songs:
-        print(f"No memory to filter against - returning all {len(trending_songs)} songs")
+        logger.debug("No memory to filter against - returning all %d songs", len(trending_songs))
         return trending_songs
     
-    print(f"Songs to filter out:")
-    for i, song in enumerate(suggested_songs):
-        print(f"  {i+1}. {song}")
+    # Drop repeated entries up front (order preserved) so each song is matched once
+    trending_songs = list(dict.fromkeys(trending_songs))
     
-    filtered = []
-    blocked_count = 0
+    # Pre-process suggested songs for efficient comparison (already done for a MemoryStore)
+    memory = _as_memory_store(suggested_songs)
+    
+    # Strategy 1: Full string exact match, resolved in bulk against a set of normalized titles
+    candidates = [song for song in trending_songs if normalize_song_title(song) not in memory.normalized]
+    blocked_count = len(trending_songs) - len(candidates)
+    logger.debug("Blocked (exact): %d songs", blocked_count)
+    
+    # Fuzzy strategies only compare against suggestions that parsed to a song name
+    if memory.named_suggestions:
+        filtered = [song for song in candidates if not _is_fuzzy_duplicate(song, memory)]
+    else:
+        filtered = candidates
+    blocked_count = len(trending_songs) - len(filtered)
     
-    # Pre-process suggested songs for efficient comparison
-    suggested_normalized = []
-    for song in suggested_songs:
-        song_name, artist_name = extract_song_parts(song)
-        suggested_normalized.append({
-            'original': song,
-            'song_name': song_name,
-            'artist_name': artist_name,
-            'full_normalized': normalize_song_title(song)
-        })
-    
-    # Apply filtering logic to each trending song
-    for trending_song in trending_songs:
-        trending_name, trending_artist = extract_song_parts(trending_song)
-        trending_normalized = normalize_song_title(trending_song)
-        
-        is_duplicate = False
-        
-        # Apply multiple matching strategies
-        for suggested in suggested_normalized:
-            # Strategy 1: Full string exact match
-            if trending_normalized == suggested['full_normalized']:
-                is_duplicate = True
-                blocked_count += 1
-                print(f"BLOCKED (exact): {trending_song} matches {suggested['original']}")
-                break
-            
-            # Strategy 2: Song name substring match
-            if trending_name and suggested['song_name']:
-                if trending_name in suggested['song_name'] or suggested['song_name'] in trending_name:
-                    is_duplicate = True
-                    blocked_count += 1
-                    print(f"BLOCKED (song name): {trending_song} matches {suggested['original']}")
-                    break
-            
-            # Strategy 3: Same artist with similar song names
-            if trending_artist and suggested['artist_name']:
-                if trending_artist == suggested['artist_name']:
-                    # Check song name similarity for same artist
-                    if trending_name and suggested['song_name']:
-                        # Calculate word overlap between song names
-                        name_similarity = len(set(trending_name.split()) & set(suggested['song_name'].split()))
-                        if name_similarity >= 1:  # At least one common word
-                            is_duplicate = True
-                            blocked_count += 1
-                            print(f"BLOCKED (same artist, similar song): {trending_song} matches {suggested['original']}")
-                            break
-        
-        # Add to filtered list if not duplicate
-        if not is_duplicate:
-            filtered.append(trending_song)
-        
     # Log filtering results
-    print(f"MEMORY FILTER RESULTS:")
-    print(f"  Blocked: {blocked_count} songs")
-    print(f"  Remaining: {len(filtered)} songs")
-    print(f"  Filter effectiveness: {(blocked_count / len(trending_songs) * 100):.1f}%")
+    logger.info(
+        "Memory filter: blocked %d, remaining %d (%.1f%% effective)",
+        blocked_count, len(filtered), blocked_count / max(1, len(trending_songs)) * 100
+    )
     
     # Emergency fallback to prevent empty results
     if len(filtered) == 0:
-        print(f"WARNING: All songs filtered out! Using emergency fallback.")
+        logger.warning("All songs filtered out! Using emergency fallback.")
         return trending_songs[-5:]  # Return last 5 songs as fallback
     
-    print(f"=== MEMORY FILTER COMPLETE ===\n")
     return filtered
 
-def create_memory_stats(suggested_songs, available_songs, request_type):
+def create_memory_stats(suggested_songs, available_songs, request_type, verbose=False):
     """
     Generate memory system statistics for API response
     
@@ -154,84 +272,112 @@ def create_memory_stats(suggested_songs, available_songs, request_type):
         suggested_songs (list): Songs previously suggested
         available_songs (list): Songs available for selection
         request_type (str): Type of user request being processed
+        verbose (bool, optional): Log the computed stats (skipped on the normal response path)
         
     Returns:
         dict: Memory statistics including counts and efficiency metrics
     """
     
     # Calculate basic metrics
-    original_count = len(available_songs) if hasattr(available_songs, '__len__') else 0
+    try:
+        original_count = len(available_songs)
+    except TypeError:
+        original_count = 0
     memory_count = len(suggested_songs) if suggested_songs else 0
+    total_count = memory_count + original_count or 1
     
     # Determine memory system status
     memory_working = memory_count > 0
     
-    print(f"MEMORY STATS CALCULATION:")
-    print(f"  Songs remembered: {memory_count}")
-    print(f"  Available songs: {original_count}")
-    print(f"  Request type: {request_type}")
-    print(f"  Memory active: {memory_working}")
+    if verbose:
+        logger.info(
+            "Memory stats: %d remembered, %d available, request type %s, active %s",
+            memory_count, original_count, request_type, memory_working
+        )
     
     return {
         "songs_remembered": memory_count,
         "songs_available": original_count,
         "request_type": request_type,
-        "memory_efficiency": memory_count / max(1, memory_count + original_count),
+        "memory_efficiency": memory_count / total_count,
         "filtering_active": memory_working,
         "memory_working": memory_working,  # Frontend compatibility flag
         "status": "active" if memory_working else "inactive"
     }
 
-def validate_memory_system(suggested_songs, new_song=None):
+def build_memory_index(suggested_songs):
+    """
+    Index memory by parsed song name for fast duplicate checks
+    
+    Args:
+        suggested_songs (list or MemoryStore): Current memory contents
+        
+    Returns:
+        dict: Song name → first memory entry with that name, in memory order
+    """
+    return _as_memory_store(suggested_songs).name_index
+
+def validate_memory_system(suggested_songs, new_song=None, memory_index=None):
     """
     Validate memory system integrity and check for potential duplicates
     
     Args:
-        suggested_songs (list): Current memory contents
+        suggested_songs (list or MemoryStore): Current memory contents
         new_song (str, optional): New song to validate against memory
+        memory_index (dict, optional): Prebuilt index from build_memory_index
         
     Returns:
         dict: Validation result with status and message
     """
-    print(f"\n=== MEMORY SYSTEM VALIDATION ===")
-    
     if not suggested_songs:
-        print(f"Memory is empty - first suggestion")
+        logger.debug("Memory is empty - first suggestion")
         return {
             "valid": True,
             "status": "empty",
             "message": "Memory system ready - no previous suggestions"
         }
     
-    print(f"Memory contains {len(suggested_songs)} songs:")
-    for i, song in enumerate(suggested_songs):
-        print(f"  {i+1}. {song}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Memory contains %d songs: %s", len(suggested_songs), list(suggested_songs))
     
     # Check new song against existing memory
-    if new_song:
-        for existing_song in suggested_songs:
-            existing_name, existing_artist = extract_song_parts(existing_song)
-            new_name, new_artist = extract_song_parts(new_song)
-            
+    new_name, _ = extract_song_parts(new_song) if new_song else ("", "")
+    if new_name:
+        if memory_index is None:
+            memory_index = build_memory_index(suggested_songs)
+        
+        # Names are unique in the index, so each one is compared once
+        for existing_name, existing_song in memory_index.items():
             # Check for song name similarity
-            if existing_name and new_name:
-                if existing_name in new_name or new_name in existing_name:
-                    print(f"DUPLICATE DETECTED!")
-                    print(f"  Existing: {existing_song}")
-                    print(f"  New: {new_song}")
-                    return {
-                        "valid": False,
-                        "status": "duplicate",
-                        "message": f"Song '{new_song}' is too similar to '{existing_song}'"
-                    }
-    
-    print(f"Memory system working correctly")
+            if existing_name in new_name or new_name in existing_name:
+                logger.info("Duplicate detected - existing: %s, new: %s", existing_song, new_song)
+                return {
+                    "valid": False,
+                    "status": "duplicate",
+                    "message": f"Song '{new_song}' is too similar to '{existing_song}'"
+                }
+    
+    logger.debug("Memory system working correctly")
     return {
         "valid": True,
         "status": "active",
         "message": f"Memory tracking {len(suggested_songs)} unique songs"
     }
 
+def count_memory_artists(suggested_songs):
+    """
+    Count how often each artist appears in memory
+    
+    Args:
+        suggested_songs (list): Memory contents to count
+        
+    Returns:
+        Counter: Artist name → number of remembered songs, in first-seen order
+    """
+    return Counter(
+        artist for artist in (extract_song_parts(song)[1] for song in suggested_songs) if artist
+    )
+
 def get_memory_insights(suggested_songs, request_type):
     """
     Analyze user music preferences based on memory contents
@@ -252,19 +398,13 @@ def get_memory_insights(suggested_songs, request_type):
         }
     
     # Extract artist information from memory
-    artists_count = {}
-    genres_detected = []
-    
-    for song in suggested_songs:
-        _, artist = extract_song_parts(song)
-        if artist:
-            artists_count[artist] = artists_count.get(artist, 0) + 1
+    artists_count = count_memory_artists(suggested_songs)
     
     # Calculate diversity and preference metrics
     return {
         'total_songs': len(suggested_songs),
         'unique_artists': len(artists_count),
-        'top_artists': sorted(artists_count.items(), key=lambda x: x[1], reverse=True)[:3],
+        'top_artists': artists_count.most_common(3),
         'listening_diversity': len(artists_count) / max(1, len(suggested_songs)),
         'current_request_type': request_type
     }
@@ -284,43 +424,70 @@ def smart_song_selection(available_songs, suggested_songs, user_preferences=None
     if not available_songs:
         return None
     
-    # Apply memory filtering
-    filtered_songs = filter_trending_songs(available_songs, suggested_songs)
-    
-    if not filtered_songs:
-        print("No new songs available after filtering")
-        return None
-    
-    # Return first available if no preferences provided
-    if not user_preferences:
-        return filtered_songs[0]
-    
-    # TODO: Implement preference-based selection algorithm
-    # Currently returns first filtered song
-    return filtered_songs[0]
+    # No memory - the first available song is new
+    if not suggested_songs:
+        return available_songs[0]
+    
+    # Apply memory filtering lazily, stopping at the first new song
+    # TODO: Implement preference-based selection algorithm using user_preferences
+    memory = _as_memory_store(suggested_songs)
+    for song in available_songs:
+        if normalize_song_title(song) in memory.normalized:
+            continue
+        if memory.named_suggestions and _is_fuzzy_duplicate(song, memory):
+            continue
+        return song
+    
+    # Same emergency fallback as filter_trending_songs when everything was suggested before
+    logger.warning("All songs filtered out! Using emergency fallback.")
+    return available_songs[-5:][0]
 
-def update_memory_context(suggested_songs, new_song, context_data=None):
+def update_memory_context(suggested_songs, new_song, context_data=None, seen=None, max_memory_size=None):
     """
     Add new song to memory if not already present
     
     Args:
-        suggested_songs (list): Current memory contents
+        suggested_songs (list or MemoryStore): Current memory contents
         new_song (str): Song to add to memory
         context_data (dict, optional): Additional context information
+        seen (set, optional): Set mirroring suggested_songs for O(1) membership checks,
+            updated in place when the song is added
+        max_memory_size (int, optional): Keep only this many most recent songs, trimming
+            in the same step instead of a separate cleanup_old_memory pass
         
     Returns:
-        list: Updated memory with new song appended
+        list or MemoryStore: Updated memory with new song appended. A MemoryStore is
+            updated and trimmed in place and returned as-is; a list is never mutated.
     """
     if not new_song:
         return suggested_songs
     
-    # Add to memory if not duplicate
-    if new_song not in suggested_songs:
-        updated_memory = suggested_songs + [new_song]
-        print(f"Memory updated: {len(suggested_songs)} → {len(updated_memory)} songs")
-        return updated_memory
+    if isinstance(suggested_songs, MemoryStore):
+        previous_count = len(suggested_songs)
+        if suggested_songs.add(new_song):
+            logger.debug("Memory updated: %d → %d songs", previous_count, len(suggested_songs))
+            if max_memory_size:
+                suggested_songs.trim(max_memory_size)
+        return suggested_songs
+    
+    # Callers that keep a seen set get a hash lookup instead of a list scan
+    if seen is not None:
+        if new_song in seen:
+            return suggested_songs
+        seen.add(new_song)
+    elif new_song in suggested_songs:
+        return suggested_songs
     
-    return suggested_songs
+    # Song is new - append to memory, dropping the oldest entries within the same copy
+    kept_songs = suggested_songs
+    if max_memory_size and len(suggested_songs) >= max_memory_size:
+        drop_count = len(suggested_songs) - max_memory_size + 1
+        kept_songs = suggested_songs[drop_count:]
+        if seen is not None:
+            seen.difference_update(suggested_songs[:drop_count])
+    updated_memory = kept_songs + [new_song]
+    logger.debug("Memory updated: %d → %d songs", len(suggested_songs), len(updated_memory))
+    return updated_memory
 
 def analyze_memory_patterns(suggested_songs):
     """
@@ -335,25 +502,15 @@ def analyze_memory_patterns(suggested_songs):
     if len(suggested_songs) < 2:
         return {"insufficient_data": True}
     
-    # Extract song and artist components
-    artists = []
-    song_names = []
-    
-    for song in suggested_songs:
-        song_name, artist = extract_song_parts(song)
-        if song_name:
-            song_names.append(song_name)
-        if artist:
-            artists.append(artist)
+    # Count artists in a single pass over memory
+    artist_counts = count_memory_artists(suggested_songs)
     
     # Calculate diversity metrics
-    unique_artists = len(set(artists))
+    unique_artists = len(artist_counts)
     total_songs = len(suggested_songs)
     artist_diversity = unique_artists / max(1, total_songs)
     
     # Identify most frequently requested artist
-    from collections import Counter
-    artist_counts = Counter(artists)
     most_popular_artist = artist_counts.most_common(1)[0] if artist_counts else None
     
     return {
@@ -370,18 +527,24 @@ def cleanup_old_memory(suggested_songs, max_memory_size=50):
     Maintain memory size by removing oldest entries when limit exceeded
     
     Args:
-        suggested_songs (list): Current memory contents
+        suggested_songs (list or MemoryStore): Current memory contents
         max_memory_size (int): Maximum number of songs to retain
         
     Returns:
-        list: Trimmed memory containing most recent songs
+        list or MemoryStore: Trimmed memory containing most recent songs. A MemoryStore
+            is trimmed in place and returned as-is; a list is returned as a new slice.
     """
-    if len(suggested_songs) <= max_memory_size:
+    previous_count = len(suggested_songs)
+    if previous_count <= max_memory_size:
         return suggested_songs
     
     # Keep most recent songs by taking from end of list
-    cleaned_memory = suggested_songs[-max_memory_size:]
-    print(f"Memory cleaned: {len(suggested_songs)} → {len(cleaned_memory)} songs")
+    if isinstance(suggested_songs, MemoryStore):
+        suggested_songs.trim(max_memory_size)
+        cleaned_memory = suggested_songs
+    else:
+        cleaned_memory = suggested_songs[-max_memory_size:]
+    logger.debug("Memory cleaned: %d → %d songs", previous_count, len(cleaned_memory))
     return cleaned_memory
 
 def get_memory_summary(suggested_songs):
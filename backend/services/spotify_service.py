@@ -10,23 +10,53 @@
 
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
+from spotipy.cache_handler import MemoryCacheHandler
+from requests.adapters import HTTPAdapter
 import os
+import atexit
+import hashlib
+import heapq
+import logging
+import tempfile
 import time
+import unicodedata
 import random
 import re
-from threading import Thread
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+from threading import BoundedSemaphore, Lock, Thread
+from typing import NamedTuple, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+try:
+    from .cache import MISSING, SQLiteTTLStore, TTLCache
+except ImportError:
+    from cache import MISSING, SQLiteTTLStore, TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Shared worker pool for parallel Spotify searches
+SPOTIFY_WORKERS = int(os.getenv('SPOTIFY_WORKERS', '10'))
+_SPOTIFY_POOL = ThreadPoolExecutor(
+    max_workers=SPOTIFY_WORKERS,
+    thread_name_prefix='spotify'
+)
+atexit.register(_SPOTIFY_POOL.shutdown, wait=False, cancel_futures=True)
 
 # Cache configuration for performance optimization
-trending_cache = {
-    'songs': [],
-    'last_updated': 0,
-    'cache_duration': 3600  # 1 hour cache expiration
-}
+trending_cache = TTLCache(maxsize=1, ttl=3600)  # 1 hour cache expiration
 
 # Search result cache to prevent duplicate API calls
-search_cache = {}
 cache_ttl = 1800  # 30 minute cache TTL
+search_cache = TTLCache(maxsize=10000, ttl=cache_ttl)
+
+# Persistent cache so search, trending and genre results survive server restarts.
+# One capped SQLite store holds every kind of entry; search keys are prefixed
+# so a query can never collide with the trending or genre entry names.
+DISK_CACHE_DIR = os.getenv('SPOTIFY_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'yain-spotify'))
+genre_cache_ttl = 3600  # 1 hour disk cache TTL for genre results
+disk_cache = SQLiteTTLStore(os.path.join(DISK_CACHE_DIR, 'spotify_cache.sqlite3'), max_entries=50000)
+SEARCH_DISK_KEY_PREFIX = 'search:'
 
 def init_spotify():
     """
@@ -36,19 +66,187 @@ def init_spotify():
         tuple: (spotify_client, enabled_status) - Client instance and boolean status
     """
     try:
+        # Keep the app token in memory; the default file handler re-reads
+        # the .cache file from disk before every API call
         spotify_credentials = SpotifyClientCredentials(
             client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-            client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
+            client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
+            cache_handler=MemoryCacheHandler()
         )
         spotify = spotipy.Spotify(client_credentials_manager=spotify_credentials)
+        _size_connection_pool(spotify)
         return spotify, True
     except:
-        print("Spotify credentials not found")
+        logger.warning("Spotify credentials not found")
         return None, False
 
+def _size_connection_pool(client):
+    """
+    Enlarge the client's HTTPS keep-alive pool to match the search worker count
+    
+    Spotipy's default adapter keeps 10 pooled connections per host, so a larger
+    worker pool would otherwise discard and re-handshake connections. The
+    adapter's retry policy is carried over unchanged.
+    
+    Args:
+        client (spotipy.Spotify): Client whose session adapter is replaced
+    """
+    try:
+        session = client._session
+        retry_policy = session.get_adapter('https://').max_retries
+        adapter = HTTPAdapter(
+            pool_connections=SPOTIFY_WORKERS,
+            pool_maxsize=SPOTIFY_WORKERS,
+            max_retries=retry_policy
+        )
+        session.mount('https://', adapter)
+    except Exception as e:
+        logger.warning("Could not resize Spotify connection pool: %s", e)
+
 # Initialize client on module import
 spotify, SPOTIFY_ENABLED = init_spotify()
 
+# Rate limiting configuration shared by all Spotify API calls
+SPOTIFY_REQUESTS_PER_SECOND = float(os.getenv('SPOTIFY_REQUESTS_PER_SECOND', '10'))
+SPOTIFY_MAX_CONCURRENT_REQUESTS = int(os.getenv('SPOTIFY_MAX_CONCURRENT_REQUESTS', '4'))
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket that paces outgoing API requests
+
+    Args:
+        rate (float): Tokens refilled per second
+        capacity (int): Maximum burst size
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_request_bucket = _TokenBucket(SPOTIFY_REQUESTS_PER_SECOND, max(1, int(SPOTIFY_REQUESTS_PER_SECOND)))
+_request_slots = BoundedSemaphore(SPOTIFY_MAX_CONCURRENT_REQUESTS)
+
+def rate_limited_call(method, *args, **kwargs):
+    """
+    Call a Spotify client method through the shared rate and concurrency limits
+    
+    HTTP 429 responses are retried by the client's own urllib3 Retry policy,
+    which honours Retry-After, so no second retry loop is layered on top here.
+
+    Args:
+        method (callable): Bound Spotify client method such as spotify.search
+        *args, **kwargs: Arguments forwarded to the method
+
+    Returns:
+        dict: Raw API response from the method
+    """
+    with _request_slots, _request_bucket:
+        return method(*args, **kwargs)
+
+def rate_limited_search(*args, **kwargs):
+    """
+    Rate-limited wrapper around spotify.search
+    
+    Concurrent calls with identical arguments share a single API request;
+    callers must treat the returned response as read-only.
+
+    Returns:
+        dict: Raw search response
+    """
+    request_key = (args, tuple(sorted(kwargs.items())))
+    return _run_once_inflight(_inflight_api_searches, request_key, rate_limited_call, spotify.search, *args, **kwargs)
+
+# In-flight request tables so concurrent identical lookups share one API call
+_inflight_lock = Lock()
+_inflight_searches = {}
+_inflight_artist_searches = {}
+_inflight_api_searches = {}
+_inflight_trending_refresh = {}
+
+def _run_once_inflight(inflight, key, func, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) once per key, letting concurrent callers with the same key wait on the result
+    
+    Args:
+        inflight (dict): In-flight table mapping keys to pending Futures
+        key (hashable): De-duplication key for the request
+        func (callable): Function performing the actual work
+        
+    Returns:
+        Any: Result of func, shared by every caller that arrived while it was running
+    """
+    with _inflight_lock:
+        future = inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            inflight[key] = future
+    
+    if not is_owner:
+        logger.debug("Joining in-flight request for: %s", key)
+        return future.result()
+    
+    try:
+        result = func(*args, **kwargs)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            inflight.pop(key, None)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=4096)
+def search_cache_key(query):
+    """
+    Fold a search query into a cache key that ignores case, accents, and spacing
+    
+    Args:
+        query (str): Raw search query
+        
+    Returns:
+        str: Normalized cache key
+    """
+    decomposed = unicodedata.normalize('NFKD', query.lower())
+    folded = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE_RE.sub(' ', folded).strip()
+
+class TrackHit(NamedTuple):
+    """Compact track match stored in search_cache"""
+    name: str
+    artist: str
+    album: str
+    preview_url: Optional[str]
+    spotify_url: str
+    image_url: Optional[str]
+    popularity: int
+    match_score: float
+
 def search_spotify_song(query):
     """
     Search Spotify for a specific song with caching and optimized API usage
@@ -63,28 +261,50 @@ def search_spotify_song(query):
     if not SPOTIFY_ENABLED:
         return None
     
-    print(f"\n=== SPOTIFY SEARCH ===")
-    print(f"Query: {query}")
+    logger.debug("Spotify search query: %s", query)
     
     # Check cache before making API call
-    cache_key = query.lower().strip()
-    current_time = time.time()
+    cache_key = search_cache_key(query)
     
-    if cache_key in search_cache:
-        cached_result, cached_time = search_cache[cache_key]
-        if current_time - cached_time < cache_ttl:
-            print(f"Cache hit! Returning cached result for: {query}")
-            return cached_result
+    cached_result = search_cache.get(cache_key, MISSING)
+    if cached_result is not MISSING:
+        logger.debug("Cache hit! Returning cached result for: %s", query)
+        track_hit = cached_result
+    else:
+        track_hit = _run_once_inflight(_inflight_searches, cache_key, _search_spotify_song_uncached, query, cache_key)
+    
+    # Convert to a fresh dict at the API boundary so callers never share cached state
+    return track_hit._asdict() if track_hit is not None else None
+
+def _search_spotify_song_uncached(query, cache_key):
+    """
+    Run the Spotify search strategies for a query and store the outcome in search_cache
+    
+    Args:
+        query (str): Song search query in format "'Song' by Artist"
+        cache_key (str): Normalized cache key for the query
+        
+    Returns:
+        TrackHit: Track metadata including name, artist, URLs, and match score
+        None: If no suitable match found
+    """
+    # Check the persistent cache before searching
+    stored_result, remaining_ttl = disk_cache.get(SEARCH_DISK_KEY_PREFIX + cache_key)
+    if stored_result is not MISSING:
+        logger.debug("Persistent cache hit for: %s", query)
+        track_hit = TrackHit(*stored_result) if stored_result is not None else None
+        search_cache.set(cache_key, track_hit, ttl=remaining_ttl)
+        return track_hit
     
     try:
         # Parse query string to extract song and artist components
         song_name, artist_name = extract_song_and_artist(query)
         
         if not song_name or not artist_name:
-            print(f"Could not parse song and artist from query")
+            logger.debug("Could not parse song and artist from query: %s", query)
             return None
         
-        print(f"Searching for: '{song_name}' by '{artist_name}'")
+        logger.debug("Searching for: %r by %r", song_name, artist_name)
         
         # Define search strategies ordered by accuracy
         search_strategies = [
@@ -96,18 +316,18 @@ def search_spotify_song(query):
         best_score = 0.0
         
         for i, strategy in enumerate(search_strategies, 1):
-            print(f"Strategy {i}/2: {strategy}")
+            logger.debug("Strategy %d/%d: %s", i, len(search_strategies), strategy)
             
             try:
                 # Execute search with single market for consistency
-                results = spotify.search(q=strategy, type='track', limit=5, market='US')
+                results = rate_limited_search(q=strategy, type='track', limit=5, market='US')
                 tracks = results['tracks']['items']
                 
                 if not tracks:
-                    print(f"  No results")
+                    logger.debug("  No results")
                     continue
                 
-                print(f"  Found {len(tracks)} results")
+                logger.debug("  Found %d results", len(tracks))
                 
                 # Score top results to find best match
                 for j, track in enumerate(tracks[:3]):
@@ -116,209 +336,278 @@ def search_spotify_song(query):
                         
                     score = calculate_match_score(
                         song_name, artist_name,
-                        track['name'], track['artists'][0]['name']
+                        track['name'], track['artists'][0]['name'],
+                        min_score=0.6
                     )
                     
-                    print(f"  {track['name']} by {track['artists'][0]['name']} (score: {score:.2f})")
+                    logger.debug("  %s by %s (score: %.2f)", track['name'], track['artists'][0]['name'], score)
                     
                     if score > best_score:
                         best_score = score
                         best_match = track
-                        print(f"  NEW BEST! Score: {score:.2f}")
+                        logger.debug("  NEW BEST! Score: %.2f", score)
                 
                 # Early termination for high-confidence matches
                 if best_score >= 0.8:
-                    print(f"High-confidence match found (score: {best_score:.2f}), stopping search")
+                    logger.debug("High-confidence match found (score: %.2f), stopping search", best_score)
                     break
                     
             except Exception as e:
-                print(f"  Error: {e}")
+                logger.warning("Spotify search strategy failed: %s", e)
                 continue
         
         # Process and format result
         result = None
         if best_match and best_score >= 0.6:
-            result = {
-                'name': best_match['name'],
-                'artist': best_match['artists'][0]['name'],
-                'album': best_match['album']['name'],
-                'preview_url': best_match['preview_url'],
-                'spotify_url': best_match['external_urls']['spotify'],
-                'image_url': best_match['album']['images'][0]['url'] if best_match['album']['images'] else None,
-                'popularity': best_match['popularity'],
-                'match_score': best_score
-            }
+            result = TrackHit(
+                name=best_match['name'],
+                artist=best_match['artists'][0]['name'],
+                album=best_match['album']['name'],
+                preview_url=best_match['preview_url'],
+                spotify_url=best_match['external_urls']['spotify'],
+                image_url=best_match['album']['images'][0]['url'] if best_match['album']['images'] else None,
+                popularity=best_match['popularity'],
+                match_score=best_score
+            )
             
-            print(f"Found: '{result['name']}' by {result['artist']} (score: {best_score:.2f})")
+            logger.debug("Found: %r by %s (score: %.2f)", result.name, result.artist, best_score)
         else:
-            print(f"No suitable match found (best score: {best_score:.2f})")
+            logger.debug("No suitable match found (best score: %.2f)", best_score)
         
         # Cache result for future requests
-        search_cache[cache_key] = (result, current_time)
+        search_cache[cache_key] = result
+        disk_cache.set(SEARCH_DISK_KEY_PREFIX + cache_key, list(result) if result is not None else None, cache_ttl)
         
         return result
                 
     except Exception as e:
-        print(f"Spotify search error: {e}")
+        logger.warning("Spotify search error: %s", e)
         return None
 
-def search_specific_genre_optimized(genre_info):
+# Trending search queries grouped into tiers, highest priority first
+TRENDING_QUERY_TIERS = (
+    # Mainstream artists and charts
+    ("taylor swift", "drake", "billie eilish", "the weeknd", "dua lipa",
+     "chart hits", "viral hits", "trending songs"),
+    
+    # Regional music priorities and genre categories
+    ("bollywood music", "kpop", "afrobeats", "latin music",
+     "indie rock", "hip hop", "electronic music", "pop music"),
+    
+    # Era-based searches
+    ("80s hits", "90s hits", "2000s hits"),
+)
+
+# Track IDs from the last search-based refresh are re-checked in bulk for a day,
+# so trending picks up new releases instead of replaying last week's tracks
+TRENDING_SEED_TTL = 86400
+SPOTIFY_TRACKS_BATCH_SIZE = 50  # Maximum IDs accepted by the Get Several Tracks endpoint
+
+def get_songs_for_track_ids(track_ids):
     """
-    Search for songs within specific genre using parallel processing
+    Resolve track IDs in batches and format the ones that are still popular
     
     Args:
-        genre_info (dict): Genre metadata containing type and search terms
+        track_ids (list): Spotify track IDs
         
     Returns:
-        list: List of formatted song strings matching the genre
+        list: Unique formatted song strings with popularity above 30
     """
-    if not SPOTIFY_ENABLED:
-        return []
-    
-    found_songs = []
-    genre_type = genre_info['type']
-    
-    # Limit search terms for performance optimization
-    search_terms = genre_info['search_terms'][:8]
-    
-    # Select optimal markets based on genre type
-    if genre_type == 'bengali':
-        markets = ['IN', 'US']
-    elif genre_type in ['tamil', 'telugu', 'punjabi', 'hindi_bollywood']:
-        markets = ['IN', 'US']
-    elif genre_type == 'afrobeats':
-        markets = ['NG', 'US']
-    elif genre_type == 'kpop':
-        markets = ['KR', 'US']
-    else:
-        markets = ['US']  # Default to US market
+    songs = []
+    seen_songs = set()
+    unique_ids = list(dict.fromkeys(track_ids))
     
-    print(f"Genre search: {len(search_terms)} terms in {len(markets)} markets")
-    
-    # Parallel search function for threading
-    def search_term_in_market(term, market):
+    for start in range(0, len(unique_ids), SPOTIFY_TRACKS_BATCH_SIZE):
+        batch = unique_ids[start:start + SPOTIFY_TRACKS_BATCH_SIZE]
         try:
-            results = spotify.search(q=term, type='track', limit=10, market=market)
-            songs = []
-            for track in results['tracks']['items']:
-                if track and track['popularity'] > 15:
-                    song_info = f"'{track['name']}' by {track['artists'][0]['name']}"
-                    songs.append(song_info)
-            return songs
+            results = rate_limited_call(spotify.tracks, batch, market='US')
         except Exception as e:
-            print(f"Error searching {term} in {market}: {e}")
-            return []
-    
-    # Execute parallel searches with thread pool
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = []
-        for term in search_terms[:6]:  # Limit concurrent searches
-            for market in markets:
-                future = executor.submit(search_term_in_market, term, market)
-                futures.append(future)
+            logger.warning("Error fetching %d tracks by ID: %s", len(batch), e)
+            continue
         
-        # Collect results as they complete with timeout
-        for future in as_completed(futures):
-            try:
-                songs = future.result(timeout=3)  # 3 second timeout per search
-                found_songs.extend(songs)
-                
-                # Early termination when sufficient results found
-                if len(found_songs) >= 30:
-                    break
-            except Exception as e:
-                print(f"Search future failed: {e}")
-                continue
-    
-    # Remove duplicates while preserving order and shuffle results
-    unique_songs = list(dict.fromkeys(found_songs))
-    random.shuffle(unique_songs)
+        for track in results['tracks']:
+            if track and track['popularity'] > 30:
+                song_info = f"'{track['name']}' by {track['artists'][0]['name']}"
+                if song_info not in seen_songs:
+                    seen_songs.add(song_info)
+                    songs.append(song_info)
     
-    print(f"Genre search result: {len(unique_songs)} unique songs for {genre_type}")
-    return unique_songs[:20]  # Return top 20 results
+    return songs
+
+# Stale-while-revalidate timing for the trending cache: a request that finds the
+# cache close to expiry still gets the cached songs and starts one background
+# refresh. Nothing refreshes while there is no traffic.
+TRENDING_REFRESH_LEAD = 600  # Seconds before expiry at which a refresh is started
+TRENDING_REFRESH_RETRY_DELAY = 60  # Minimum gap between background refresh attempts
+
+_trending_refresh_lock = Lock()
+_trending_refresh_running = False
+_trending_refresh_not_before = 0.0
+
+def _background_trending_refresh():
+    """
+    Refresh the trending cache off the request path, then allow the next attempt after a pause
+    """
+    global _trending_refresh_running, _trending_refresh_not_before
+    try:
+        refresh_trending_songs()
+    except Exception as e:
+        logger.warning("Background trending refresh failed: %s", e)
+    finally:
+        with _trending_refresh_lock:
+            _trending_refresh_running = False
+            _trending_refresh_not_before = time.monotonic() + TRENDING_REFRESH_RETRY_DELAY
+
+def _schedule_trending_refresh():
+    """
+    Start a one-off background refresh unless one is running or the last attempt was too recent
+    """
+    global _trending_refresh_running
+    with _trending_refresh_lock:
+        if _trending_refresh_running or time.monotonic() < _trending_refresh_not_before:
+            return
+        _trending_refresh_running = True
+    Thread(target=_background_trending_refresh, name='spotify-trending-refresh', daemon=True).start()
 
 def get_trending_songs_optimized():
     """
     Retrieve trending songs using cached results and parallel processing
     
+    When the cached songs are close to expiry they are still returned, and a
+    background refresh replaces them before they run out.
+    
     Returns:
         list: List of formatted trending song strings
     """
     if not SPOTIFY_ENABLED:
         return get_diverse_fallback_songs()
     
-    current_time = time.time()
-    
     # Return cached results if still valid
-    if (current_time - trending_cache['last_updated']) < trending_cache['cache_duration']:
-        print(f"Using cached trending songs ({len(trending_cache['songs'])} songs)")
-        return trending_cache['songs']
+    cached_songs = trending_cache.get('trending')
+    if cached_songs is not None:
+        logger.debug("Using cached trending songs (%d songs)", len(cached_songs))
+        if trending_cache.remaining_ttl('trending') < TRENDING_REFRESH_LEAD:
+            _schedule_trending_refresh()
+        return cached_songs
     
-    print(f"Refreshing trending cache...")
+    # Fall back to the on-disk snapshot from a previous process
+    cached_songs, remaining_ttl = disk_cache.get('trending')
+    if cached_songs is not MISSING and cached_songs:
+        trending_cache.set('trending', cached_songs, ttl=remaining_ttl)
+        logger.debug("Loaded trending songs from disk cache (%d songs)", len(cached_songs))
+        return cached_songs
+    
+    return refresh_trending_songs()
+
+def refresh_trending_songs():
+    """
+    Rebuild the trending cache from Spotify, sharing one refresh between concurrent callers
+    
+    Returns:
+        list: List of formatted trending song strings, or fallback songs on failure
+    """
+    return _run_once_inflight(_inflight_trending_refresh, 'trending', _refresh_trending_songs_uncached)
+
+def _refresh_trending_songs_uncached():
+    """
+    Fetch trending songs from seed IDs or tiered searches and store them in the caches
+    
+    Returns:
+        list: List of formatted trending song strings, or fallback songs on failure
+    """
+    logger.debug("Refreshing trending cache...")
     
     try:
-        trending_songs = []
+        # Cheap path: re-check the seed IDs from the last search-based refresh within the
+        # past day, in a couple of batched calls
+        seed_ids, _ = disk_cache.get('trending_seed_ids')
+        if seed_ids is not MISSING and seed_ids:
+            trending_songs = get_songs_for_track_ids(seed_ids)
+            if trending_songs:
+                random.shuffle(trending_songs)
+                cached_songs = trending_songs[:100]
+                trending_cache['trending'] = cached_songs
+                disk_cache.set('trending', cached_songs, trending_cache.ttl)
+                logger.debug("Refreshed %d trending songs from %d seed IDs", len(cached_songs), len(seed_ids))
+                return cached_songs
         
-        # Define priority search queries for trending content
-        priority_queries = [
-            # Mainstream artists
-            "taylor swift", "drake", "billie eilish", "the weeknd", "dua lipa",
-            "chart hits", "viral hits", "trending songs",
-            
-            # Regional music priorities  
-            "bollywood music", "kpop", "afrobeats", "latin music",
-            
-            # Genre categories
-            "indie rock", "hip hop", "electronic music", "pop music",
-            
-            # Era-based searches
-            "80s hits", "90s hits", "2000s hits",
-        ]
+        trending_songs = []
+        track_ids = {}  # Song string -> Spotify track ID, for the seed list
         
         # Parallel search function for trending queries
         def search_query(query):
             try:
-                results = spotify.search(q=query, type='track', limit=15, market='US')
+                results = rate_limited_search(q=query, type='track', limit=15, market='US')
                 songs = []
                 for track in results['tracks']['items']:
                     if track and track['popularity'] > 30:
                         song_info = f"'{track['name']}' by {track['artists'][0]['name']}"
-                        songs.append(song_info)
+                        songs.append((song_info, track.get('id')))
                 return songs
             except Exception as e:
-                print(f"Error with query '{query}': {e}")
+                logger.warning("Error with query %r: %s", query, e)
                 return []
         
-        # Execute parallel searches with timeout handling
-        with ThreadPoolExecutor(max_workers=6) as executor:
-            futures = [executor.submit(search_query, query) for query in priority_queries]
+        # Run tiers in priority order so mainstream queries always complete first
+        for tier_number, tier_queries in enumerate(TRENDING_QUERY_TIERS, 1):
+            futures = [_SPOTIFY_POOL.submit(search_query, query) for query in tier_queries]
             
             for future in as_completed(futures):
                 try:
                     songs = future.result(timeout=5)  # 5 second timeout
-                    for song in songs:
-                        if song not in trending_songs:  # Prevent duplicates
+                    for song, track_id in songs:
+                        if song not in track_ids:  # Prevent duplicates
+                            track_ids[song] = track_id
                             trending_songs.append(song)
                     
                     # Early termination when sufficient results collected
                     if len(trending_songs) >= 150:
                         break
                 except Exception as e:
-                    print(f"Future failed: {e}")
+                    logger.warning("Future failed: %s", e)
                     continue
+            
+            # Drop queued searches that are no longer needed
+            for future in futures:
+                future.cancel()
+            
+            if len(trending_songs) >= 150:
+                logger.debug("Trending target reached after tier %d/%d", tier_number, len(TRENDING_QUERY_TIERS))
+                break
+        
+        # Every search failed - keep whatever is cached so the next request retries
+        if not trending_songs:
+            logger.warning("No trending songs found, keeping the existing cache")
+            return get_diverse_fallback_songs()
         
         # Randomize results and update cache
         random.shuffle(trending_songs)
-        trending_cache['songs'] = trending_songs[:100]  # Store top 100 results
-        trending_cache['last_updated'] = current_time
+        cached_songs = trending_songs[:100]  # Store top 100 results
+        trending_cache['trending'] = cached_songs
+        disk_cache.set('trending', cached_songs, trending_cache.ttl)
+        disk_cache.set(
+            'trending_seed_ids',
+            [track_ids[song] for song in cached_songs if track_ids[song]],
+            TRENDING_SEED_TTL
+        )
         
-        print(f"Cached {len(trending_cache['songs'])} trending songs")
-        return trending_cache['songs']
+        logger.debug("Cached %d trending songs", len(cached_songs))
+        return cached_songs
         
     except Exception as e:
-        print(f"Error updating trending songs: {e}")
+        logger.warning("Error updating trending songs: %s", e)
         return get_diverse_fallback_songs()
 
+# Query parsing patterns; the quoted 'Song' by Artist form (groups 1-2) takes
+# priority over the bare Song by Artist form (groups 3-4), as the old
+# two-pattern loop did
+_QUERY_RE = re.compile(
+    r"""^(?:[\s\S]*?['"]([^'"]+)['"] by (.+)|[\s\S]*?([^'"]+) by (.+))""",
+    re.IGNORECASE
+)
+_ARTIST_TAIL_RE = re.compile(r'[.!?–—,-]+.*$')
+
+@lru_cache(maxsize=2048)
 def extract_song_and_artist(query):
     """
     Parse query string to extract song name and artist using regex patterns
@@ -329,22 +618,36 @@ def extract_song_and_artist(query):
     Returns:
         tuple: (song_name, artist_name) or (None, None) if parsing fails
     """
-    patterns = [
-        r"['\"]([^'\"]+)['\"] by (.+)",  # 'Song' by Artist format
-        r"([^'\"]+) by (.+)",           # Song by Artist format
-    ]
+    match = _QUERY_RE.match(query)
+    if not match:
+        return None, None
     
-    for pattern in patterns:
-        match = re.search(pattern, query, re.IGNORECASE)
-        if match:
-            song_name = match.group(1).strip()
-            artist_name = match.group(2).strip()
-            # Clean artist name by removing trailing punctuation
-            artist_name = re.sub(r'[.!?–—,-]+.*$', '', artist_name).strip()
-            return song_name, artist_name
+    if match.group(1) is not None:
+        song_name, artist_name = match.group(1), match.group(2)
+    else:
+        song_name, artist_name = match.group(3), match.group(4)
     
-    return None, None
+    # Clean artist name by removing trailing punctuation
+    artist_name = _ARTIST_TAIL_RE.sub('', artist_name.strip()).strip()
+    return song_name.strip(), artist_name
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
 
+@lru_cache(maxsize=4096)
+def _normalize_for_similarity(text):
+    """
+    Lowercase and strip punctuation from text, returning its word set alongside
+    
+    Args:
+        text (str): Text to normalize
+        
+    Returns:
+        tuple: (normalized_text, frozenset_of_words)
+    """
+    normalized = _PUNCT_RE.sub('', text.lower()).strip()
+    return normalized, frozenset(normalized.split())
+
+@lru_cache(maxsize=2048)
 def calculate_string_similarity(str1, str2):
     """
     Calculate similarity score between two strings using word overlap analysis
@@ -358,11 +661,8 @@ def calculate_string_similarity(str1, str2):
     if not str1 or not str2:
         return 0.0
     
-    def normalize(text):
-        return re.sub(r'[^\w\s]', '', text.lower()).strip()
-    
-    norm1 = normalize(str1)
-    norm2 = normalize(str2)
+    norm1, words1 = _normalize_for_similarity(str1)
+    norm2, words2 = _normalize_for_similarity(str2)
     
     # Check for exact match
     if norm1 == norm2:
@@ -373,48 +673,55 @@ def calculate_string_similarity(str1, str2):
         return 0.9
     
     # Calculate word overlap using Jaccard similarity
-    words1 = set(norm1.split())
-    words2 = set(norm2.split())
-    
     if not words1 or not words2:
         return 0.0
     
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    intersection = len(words1 & words2)
+    union = len(words1 | words2)
     
     return intersection / union if union > 0 else 0.0
 
-def calculate_match_score(target_song, target_artist, result_song, result_artist):
+def calculate_match_score(target_song, target_artist, result_song, result_artist, min_score=0.0):
     """
     Calculate weighted match score between target and result track metadata
     
     Args:
         target_song, target_artist (str): Expected track information
         result_song, result_artist (str): API result track information
+        min_score (float): Acceptance threshold; results that cannot reach it
+            skip the artist comparison and return a lower bound instead
         
     Returns:
         float: Weighted match score (song 60%, artist 40%)
     """
     song_score = calculate_string_similarity(target_song, result_song)
+    
+    # Artist similarity is at most 1.0, so a weak title can be rejected early
+    if song_score * 0.6 + 0.4 < min_score:
+        return song_score * 0.6
+    
     artist_score = calculate_string_similarity(target_artist, result_artist)
     return (song_score * 0.6) + (artist_score * 0.4)
 
+# Curated fallback songs across various genres and eras
+_FALLBACK_SONGS = (
+    "'Anti-Hero' by Taylor Swift", "'God's Plan' by Drake", "'Bad Guy' by Billie Eilish",
+    "'Blinding Lights' by The Weeknd", "'Levitating' by Dua Lipa", "'As It Was' by Harry Styles",
+    "'Heat Waves' by Glass Animals", "'Good 4 U' by Olivia Rodrigo", "'Stay' by The Kid LAROI",
+    "'Jai Ho' by A.R. Rahman", "'Tum Hi Ho' by Arijit Singh", "'Dynamite' by BTS",
+    "'Despacito' by Luis Fonsi", "'Ye' by Burna Boy", "'Essence' by Wizkid",
+    "'Motion Sickness' by Phoebe Bridgers", "'The Less I Know The Better' by Tame Impala",
+    "'Bohemian Rhapsody' by Queen", "'Billie Jean' by Michael Jackson", "'Smells Like Teen Spirit' by Nirvana"
+)
+
 def get_diverse_fallback_songs():
     """
     Provide hardcoded song list as fallback when Spotify API is unavailable
     
     Returns:
-        list: Curated list of popular songs across various genres and eras
-    """
-    return [
-        "'Anti-Hero' by Taylor Swift", "'God's Plan' by Drake", "'Bad Guy' by Billie Eilish",
-        "'Blinding Lights' by The Weeknd", "'Levitating' by Dua Lipa", "'As It Was' by Harry Styles",
-        "'Heat Waves' by Glass Animals", "'Good 4 U' by Olivia Rodrigo", "'Stay' by The Kid LAROI",
-        "'Jai Ho' by A.R. Rahman", "'Tum Hi Ho' by Arijit Singh", "'Dynamite' by BTS",
-        "'Despacito' by Luis Fonsi", "'Ye' by Burna Boy", "'Essence' by Wizkid",
-        "'Motion Sickness' by Phoebe Bridgers", "'The Less I Know The Better' by Tame Impala",
-        "'Bohemian Rhapsody' by Queen", "'Billie Jean' by Michael Jackson", "'Smells Like Teen Spirit' by Nirvana"
-    ]
+        tuple: Immutable curated list of popular songs across various genres and eras
+    """
+    return _FALLBACK_SONGS
 
 def get_smart_songs_from_results(tracks, limit=15):
     """
@@ -435,9 +742,13 @@ def get_smart_songs_from_results(tracks, limit=15):
     for track in tracks:
         if not track:
             continue
-            
-        # Calculate composite score based on multiple quality factors
+        
+        # Filter out low-popularity tracks before scoring
         popularity = track.get('popularity', 0)
+        if popularity <= 15:
+            continue
+        
+        # Calculate composite score based on multiple quality factors
         score = popularity
         
         # Apply popularity bonuses
@@ -454,31 +765,84 @@ def get_smart_songs_from_results(tracks, limit=15):
         if track.get('explicit'):
             score += 3
         
-        # Filter out low-popularity tracks
-        if popularity > 15:
-            song_info = f"'{track['name']}' by {track['artists'][0]['name']}"
-            smart_songs.append({
-                'song': song_info,
-                'score': score,
-                'popularity': popularity
-            })
+        smart_songs.append((score, popularity, track))
     
-    # Sort by composite score in descending order
-    smart_songs.sort(key=lambda x: x['score'], reverse=True)
+    # Select the top scores without sorting everything (ties keep API order)
+    top_songs = heapq.nlargest(limit, smart_songs, key=itemgetter(0))
     
-    # Extract song strings from sorted results
-    result = [item['song'] for item in smart_songs[:limit]]
+    # Format song strings only for the selected tracks
+    result = [
+        f"'{track['name']}' by {track['artists'][0]['name']}"
+        for _, _, track in top_songs
+    ]
     
-    print(f"Smart selection: Picked {len(result)} songs (popularity range: {smart_songs[0]['popularity'] if smart_songs else 0}-{smart_songs[-1]['popularity'] if smart_songs else 0})")
+    if logger.isEnabledFor(logging.DEBUG):
+        # Lowest-scoring candidate, taking the last one on ties as a full sort would
+        lowest = min(reversed(smart_songs), key=itemgetter(0)) if smart_songs else None
+        logger.debug(
+            "Smart selection: Picked %d songs (popularity range: %d-%d)",
+            len(result),
+            top_songs[0][1] if top_songs else 0,
+            lowest[1] if lowest else 0
+        )
     
     return result
 
+# Spotify markets searched per genre, ordered by geographic relevance
+_DEFAULT_MARKETS = ('US',)
+_GENRE_MARKETS = {
+    'bengali': ('IN', 'US'),
+    'tamil': ('IN', 'US'),
+    'telugu': ('IN', 'US'),
+    'punjabi': ('IN', 'US'),
+    'hindi_bollywood': ('IN', 'US'),
+    'afrobeats': ('NG', 'US'),
+    'kpop': ('KR', 'US'),
+}
+
+# Markets whose top results overlap the primary market this much are skipped
+MARKET_OVERLAP_THRESHOLD = 0.7
+market_decision_ttl = 86400  # 24 hour disk cache TTL for market decisions
+
+def select_markets_by_overlap(markets, sample_results):
+    """
+    Keep only the primary market when every other market returns near-identical top tracks
+    
+    Args:
+        markets (tuple): Candidate markets, primary market first
+        sample_results (dict): Filtered track lists for one search term, keyed by market
+        
+    Returns:
+        tuple: markets[:1] if all extra markets overlap the primary, otherwise markets
+    """
+    def top_track_ids(market):
+        return {track['id'] for track in sample_results.get(market, [])[:3] if track.get('id')}
+    
+    primary_ids = top_track_ids(markets[0])
+    if not primary_ids:
+        return markets
+    
+    for market in markets[1:]:
+        other_ids = top_track_ids(market)
+        if not other_ids:
+            return markets
+        overlap = len(primary_ids & other_ids) / len(primary_ids | other_ids)
+        if overlap < MARKET_OVERLAP_THRESHOLD:
+            return markets
+    
+    logger.debug("Top results overlap across %s, searching %s only", markets, markets[0])
+    return markets[:1]
+
+# Parallel searches per batch; 60 wanted tracks / 15 per search means a batch
+# of 4 can finish the genre search without issuing surplus requests
+GENRE_SEARCH_BATCH_SIZE = 4
+
 def search_specific_genre_smart(genre_info):
     """
     Enhanced genre search using intelligent track selection algorithm
     
     Args:
-        genre_info (dict): Genre metadata with type and search terms
+        genre_info (Category): Genre metadata with type and search terms
         
     Returns:
         list: Intelligently selected songs matching the genre
@@ -487,50 +851,92 @@ def search_specific_genre_smart(genre_info):
         return []
     
     found_tracks = []  # Store track objects for intelligent processing
-    genre_type = genre_info['type']
+    genre_type = genre_info.type
     
     # Optimize search terms for better API efficiency
-    search_terms = genre_info['search_terms'][:6]
+    search_terms = genre_info.search_terms[:6]
     
     # Select markets based on genre geographic relevance
-    if genre_type == 'bengali':
-        markets = ['IN', 'US']
-    elif genre_type in ['tamil', 'telugu', 'punjabi', 'hindi_bollywood']:
-        markets = ['IN', 'US']
-    elif genre_type == 'afrobeats':
-        markets = ['NG', 'US']
-    elif genre_type == 'kpop':
-        markets = ['KR', 'US']
-    else:
-        markets = ['US']
+    markets = _GENRE_MARKETS.get(genre_type, _DEFAULT_MARKETS)
     
-    print(f"Smart genre search: {len(search_terms)} terms in {len(markets)} markets")
+    # Reuse a recent decision on whether the extra markets add distinct results
+    market_decision_name = f"markets_{genre_type}"
+    markets_decided = False
+    if len(markets) > 1:
+        cached_markets, _ = disk_cache.get(market_decision_name)
+        if cached_markets is not MISSING and cached_markets:
+            markets = tuple(cached_markets)
+            markets_decided = True
+    
+    # Reuse a recent on-disk result for the same genre and search terms
+    terms_digest = hashlib.sha1('\n'.join(search_terms).encode('utf-8')).hexdigest()[:16]
+    disk_cache_name = f"genre_{genre_type}_{terms_digest}"
+    cached_songs, _ = disk_cache.get(disk_cache_name)
+    if cached_songs is not MISSING and cached_songs:
+        logger.debug("Using disk-cached genre songs for %s (%d songs)", genre_type, len(cached_songs))
+        return cached_songs
+    
+    logger.debug("Smart genre search: %d terms in %d markets", len(search_terms), len(markets))
+    
+    def search_term_in_market(term, market):
+        tracks = []
+        try:
+            results = rate_limited_search(q=term, type='track', limit=15, market=market)
+            for track in results['tracks']['items']:
+                if track and track['popularity'] > 15:
+                    tracks.append(track)
+        except Exception as e:
+            logger.warning("Error searching %s in %s: %s", term, market, e)
+        return tracks
     
     try:
-        for term in search_terms:
-            for market in markets:
-                try:
-                    results = spotify.search(q=term, type='track', limit=15, market=market)
-                    for track in results['tracks']['items']:
-                        if track and track['popularity'] > 15:
-                            found_tracks.append(track)
-                    
-                    # Early termination for performance
-                    if len(found_tracks) >= 60:
-                        break
-                except Exception as e:
-                    print(f"Error searching {term} in {market}: {e}")
-                    continue
+        searches = [(term, market) for term in search_terms for market in markets]
+        
+        # The first term is searched in every market; its results decide
+        # whether the extra markets are worth querying for the remaining terms
+        sample_results = {} if len(markets) > 1 and not markets_decided else None
+        
+        # Run searches in small parallel batches; results are merged in the
+        # original term/market order so the selection matches a serial scan
+        start = 0
+        while start < len(searches):
+            batch = searches[start:start + GENRE_SEARCH_BATCH_SIZE]
+            futures = [_SPOTIFY_POOL.submit(search_term_in_market, term, market) for term, market in batch]
+            
+            for index, future in enumerate(futures, start):
+                tracks = future.result()
+                if sample_results is not None and index < len(markets):
+                    sample_results[searches[index][1]] = tracks
+                found_tracks.extend(tracks)
+                
+                # Early termination for performance
+                if len(found_tracks) >= 60:
+                    break
             
             if len(found_tracks) >= 60:
+                for future in futures:
+                    future.cancel()
                 break
+            
+            start += len(batch)
+            
+            if sample_results is not None and len(sample_results) == len(markets):
+                markets = select_markets_by_overlap(markets, sample_results)
+                disk_cache.set(market_decision_name, list(markets), market_decision_ttl)
+                searches = searches[:start] + [
+                    (term, market) for term, market in searches[start:] if market in markets
+                ]
+                sample_results = None
     
     except Exception as e:
-        print(f"Smart genre search error: {e}")
+        logger.warning("Smart genre search error: %s", e)
         return []
     
     # Apply intelligent selection to track objects
-    return get_smart_songs_from_results(found_tracks, 20)
+    selected_songs = get_smart_songs_from_results(found_tracks, 20)
+    if selected_songs:
+        disk_cache.set(disk_cache_name, selected_songs, genre_cache_ttl)
+    return selected_songs
 
 def search_artist_songs_smart(artist_name, limit=15):
     """
@@ -546,12 +952,26 @@ def search_artist_songs_smart(artist_name, limit=15):
     if not SPOTIFY_ENABLED:
         return []
     
+    inflight_key = (artist_name.lower().strip(), limit)
+    return _run_once_inflight(_inflight_artist_searches, inflight_key, _search_artist_songs_uncached, artist_name, limit)
+
+def _search_artist_songs_uncached(artist_name, limit):
+    """
+    Collect top tracks and catalog matches for an artist
+    
+    Args:
+        artist_name (str): Name of artist to search for
+        limit (int): Maximum number of songs to return
+        
+    Returns:
+        list: Intelligently selected songs by the artist
+    """
     found_tracks = []
-    print(f"Smart artist search: {artist_name}")
+    logger.debug("Smart artist search: %s", artist_name)
     
     try:
         # Step 1: Find the most relevant artist by popularity
-        artist_search_results = spotify.search(
+        artist_search_results = rate_limited_search(
             q=f'artist:"{artist_name}"', 
             type='artist', 
             limit=10, 
@@ -579,14 +999,14 @@ def search_artist_songs_smart(artist_name, limit=15):
         artist_id = best_artist['id']
         
         # Step 2: Get top tracks (pre-sorted by popularity)
-        top_tracks = spotify.artist_top_tracks(artist_id, country='US')
+        top_tracks = rate_limited_call(spotify.artist_top_tracks, artist_id, country='US')
         for track in top_tracks['tracks']:
             if track and track['popularity'] > 10:
                 found_tracks.append(track)
         
         # Step 3: Supplement with additional catalog search if needed
         if len(found_tracks) < 12:
-            additional_results = spotify.search(
+            additional_results = rate_limited_search(
                 q=f'artist:"{selected_artist}"', 
                 type='track', 
                 limit=25, 
@@ -606,7 +1026,7 @@ def search_artist_songs_smart(artist_name, limit=15):
         return get_smart_songs_from_results(found_tracks, limit)
         
     except Exception as e:
-        print(f"Smart artist search failed: {e}")
+        logger.warning("Smart artist search failed: %s", e)
         return []
 
 # Function aliases for backward compatibility
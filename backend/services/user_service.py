@@ -11,11 +11,26 @@
 
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
+from spotipy.cache_handler import MemoryCacheHandler
+from requests.adapters import HTTPAdapter
 import os
 import json
 import time
+import atexit
+import logging
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from threading import Lock
 from datetime import datetime, timedelta
 
+try:
+    import redis  # Optional: only needed when REDIS_URL is set
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
 # 🔐 Spotify OAuth Configuration
 SPOTIFY_SCOPE = [
     'user-read-private',           # Read user profile
@@ -26,9 +41,29 @@ SPOTIFY_SCOPE = [
     'playlist-read-collaborative', # Read collaborative playlists
     'user-read-recently-played',   # Read listening history
 ]
+SPOTIFY_SCOPE_STR = ' '.join(SPOTIFY_SCOPE)
+
+# 🗄️ In-memory user storage, used when no shared Redis store is configured.
+# Kept in LRU order and capped so a long-running worker doesn't grow forever.
+user_profiles = OrderedDict()
+_user_profiles_lock = Lock()
+MAX_USER_PROFILES = 5000
+MAX_SUGGESTION_HISTORY = 200
 
-# 🗄️ In-memory user storage (replace with database later)
-user_profiles = {}
+# 🌐 Optional Redis store so every worker process sees the same profiles
+REDIS_URL = os.getenv('REDIS_URL')
+PROFILE_STORE_TTL = 3600  # seconds
+
+# ⏱️ Reuse a stored analysis if the user reconnects within this window
+PROFILE_CACHE_TTL = timedelta(minutes=10)
+
+# ⚡ Shared pool for the concurrent Spotify fetches made during profile analysis
+PROFILE_FETCH_WORKERS = int(os.getenv('PROFILE_FETCH_WORKERS', '6'))
+_PROFILE_POOL = ThreadPoolExecutor(
+    max_workers=PROFILE_FETCH_WORKERS,
+    thread_name_prefix='profile'
+)
+atexit.register(_PROFILE_POOL.shutdown, wait=False, cancel_futures=True)
 
 # Fix the SpotifyUserAuth class in user_service.py
 
@@ -47,58 +82,73 @@ class SpotifyUserAuth:
         else:
             self.redirect_uri = 'http://localhost:5000/callback'
         
-        print(f"🔗 Using redirect URI: {self.redirect_uri}")
-        print(f"🔑 Client ID: {'✅ Set' if self.client_id else '❌ Missing'}")
-        print(f"🔒 Client Secret: {'✅ Set' if self.client_secret else '❌ Missing'}")
+        logger.debug("Using redirect URI: %s", self.redirect_uri)
+        logger.debug("Client ID: %s", 'set' if self.client_id else 'missing')
+        logger.debug("Client Secret: %s", 'set' if self.client_secret else 'missing')
+        
+        # One OAuth helper for every request; the per-user state is passed to
+        # get_authorize_url, and tokens stay in memory instead of a shared .cache file
+        self.sp_oauth = None
+        if self.client_id and self.client_secret:
+            self.sp_oauth = SpotifyOAuth(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                redirect_uri=self.redirect_uri,
+                scope=SPOTIFY_SCOPE_STR,
+                show_dialog=True,
+                cache_handler=MemoryCacheHandler()
+            )
     
     def get_auth_url(self, user_id):
         """Get Spotify authorization URL for user"""
         try:
             if not self.client_id or not self.client_secret:
-                print("❌ Missing Spotify credentials!")
+                logger.warning("Missing Spotify credentials")
                 return None
                 
-            sp_oauth = SpotifyOAuth(
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-                redirect_uri=self.redirect_uri,
-                scope=' '.join(SPOTIFY_SCOPE),
-                state=user_id,  # Use user_id as state for security
-                show_dialog=True
-            )
-            
-            auth_url = sp_oauth.get_authorize_url()
-            print(f"✅ Generated auth URL: {auth_url[:50]}...")
+            auth_url = self.sp_oauth.get_authorize_url(state=user_id)  # Use user_id as state for security
+            logger.debug("Generated auth URL: %.50s...", auth_url)
             return auth_url
             
         except Exception as e:
-            print(f"❌ Error creating auth URL: {e}")
+            logger.warning("Error creating auth URL: %s", e)
             return None
     
     def get_user_token(self, code, user_id):
         """Exchange authorization code for access token"""
         try:
-            sp_oauth = SpotifyOAuth(
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-                redirect_uri=self.redirect_uri,
-                scope=' '.join(SPOTIFY_SCOPE),
-                state=user_id
-            )
+            if not self.sp_oauth:
+                logger.warning("Missing Spotify credentials")
+                return None
             
-            token_info = sp_oauth.get_access_token(code)
-            print(f"✅ Token obtained for user: {user_id}")
+            # Always exchange the single-use code; never trust the caller-supplied state alone
+            token_info = self.sp_oauth.get_access_token(code, check_cache=False)
+            logger.debug("Token obtained for user: %s", user_id)
             return token_info
             
         except Exception as e:
-            print(f"❌ Error getting access token: {e}")
+            logger.warning("Error getting access token: %s", e)
             return None
 class UserProfileAnalyzer:
     """🎭 Analyze user's Spotify profile and extract music preferences"""
     
     def __init__(self, access_token):
         self.spotify = spotipy.Spotify(auth=access_token)
-        
+        self._size_connection_pool()
+    
+    def _size_connection_pool(self):
+        """Keep enough pooled keep-alive connections for the concurrent analysis fetches"""
+        try:
+            session = self.spotify._session
+            retry_policy = session.get_adapter('https://').max_retries
+            session.mount('https://', HTTPAdapter(
+                pool_connections=PROFILE_FETCH_WORKERS,
+                pool_maxsize=PROFILE_FETCH_WORKERS,
+                max_retries=retry_policy
+            ))
+        except Exception as e:
+            logger.warning("Could not resize profile connection pool: %s", e)
+    
     def get_user_profile(self):
         """Get basic user profile information"""
         try:
@@ -112,7 +162,7 @@ class UserProfileAnalyzer:
                 'image': user_info.get('images', [{}])[0].get('url') if user_info.get('images') else None
             }
         except Exception as e:
-            print(f"❌ Error getting user profile: {e}")
+            logger.warning("Error getting user profile: %s", e)
             return None
     
     def get_top_artists(self, time_range='medium_term', limit=50):
@@ -135,7 +185,7 @@ class UserProfileAnalyzer:
             return artists
             
         except Exception as e:
-            print(f"❌ Error getting top artists: {e}")
+            logger.warning("Error getting top artists: %s", e)
             return []
     
     def get_top_tracks(self, time_range='medium_term', limit=50):
@@ -159,7 +209,7 @@ class UserProfileAnalyzer:
             return tracks
             
         except Exception as e:
-            print(f"❌ Error getting top tracks: {e}")
+            logger.warning("Error getting top tracks: %s", e)
             return []
     
     def get_saved_tracks(self, limit=50):
@@ -181,7 +231,7 @@ class UserProfileAnalyzer:
             return tracks
             
         except Exception as e:
-            print(f"❌ Error getting saved tracks: {e}")
+            logger.warning("Error getting saved tracks: %s", e)
             return []
     
     def get_user_playlists(self, limit=20):
@@ -205,41 +255,35 @@ class UserProfileAnalyzer:
             return playlists
             
         except Exception as e:
-            print(f"❌ Error getting playlists: {e}")
+            logger.warning("Error getting playlists: %s", e)
             return []
     
     def analyze_music_preferences(self):
         """🎯 Comprehensive analysis of user's music taste"""
-        print("🔍 Analyzing user's music preferences...")
-        
-        # Get all data
-        top_artists_short = self.get_top_artists('short_term', 20)  # Last 4 weeks
-        top_artists_medium = self.get_top_artists('medium_term', 30)  # Last 6 months
-        top_tracks_short = self.get_top_tracks('short_term', 20)
-        top_tracks_medium = self.get_top_tracks('medium_term', 30)
-        saved_tracks = self.get_saved_tracks(50)
-        playlists = self.get_user_playlists(15)
-        
-        # Analyze genres
-        all_genres = []
-        for artist in top_artists_short + top_artists_medium:
-            all_genres.extend(artist['genres'])
+        logger.debug("Analyzing user's music preferences...")
         
-        # Count genre frequency
-        genre_counts = {}
-        for genre in all_genres:
-            genre_counts[genre] = genre_counts.get(genre, 0) + 1
+        # Get all data - the six requests are independent, so run them concurrently
+        # (each getter already catches its own errors and returns an empty result)
+        futures = [
+            _PROFILE_POOL.submit(self.get_top_artists, 'short_term', 20),  # Last 4 weeks
+            _PROFILE_POOL.submit(self.get_top_artists, 'medium_term', 30),  # Last 6 months
+            _PROFILE_POOL.submit(self.get_top_tracks, 'short_term', 20),
+            _PROFILE_POOL.submit(self.get_top_tracks, 'medium_term', 30),
+            _PROFILE_POOL.submit(self.get_saved_tracks, 50),
+            _PROFILE_POOL.submit(self.get_user_playlists, 15),
+        ]
+        (top_artists_short, top_artists_medium, top_tracks_short,
+         top_tracks_medium, saved_tracks, playlists) = [future.result() for future in futures]
         
-        # Get top genres
-        top_genres = sorted(genre_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Count genre and artist frequency in one pass over both time ranges
+        genre_counts = Counter()
+        artist_counts = Counter()
+        for artist in chain(top_artists_short, top_artists_medium):
+            genre_counts.update(artist['genres'])
+            artist_counts[artist['name']] += 1
         
-        # Analyze favorite artists
-        artist_counts = {}
-        for artist in top_artists_short + top_artists_medium:
-            name = artist['name']
-            artist_counts[name] = artist_counts.get(name, 0) + 1
-        
-        top_artists = sorted(artist_counts.items(), key=lambda x: x[1], reverse=True)[:15]
+        top_genres = genre_counts.most_common(10)
+        top_artists = artist_counts.most_common(15)
         
         # Create user music profile
         music_profile = {
@@ -249,13 +293,87 @@ class UserProfileAnalyzer:
             'all_time_favorites': [track['name'] + ' by ' + track['artist'] for track in top_tracks_medium[:10]],
             'saved_songs_count': len(saved_tracks),
             'playlist_count': len(playlists),
-            'music_diversity': len(set(all_genres)),  # How diverse their taste is
+            'music_diversity': len(genre_counts),  # How diverse their taste is
             'analysis_date': datetime.now().isoformat()
         }
         
-        print(f"🎵 Analysis complete! Found {len(top_genres)} genres, {len(top_artists)} artists")
+        logger.debug("Analysis complete! Found %d genres, %d artists", len(top_genres), len(top_artists))
         return music_profile
 
+class RedisProfileStore:
+    """🌐 Keep user profiles in Redis so they are shared across worker processes"""
+    
+    KEY_PREFIX = 'yain:profile:'
+    
+    def __init__(self, url, ttl=PROFILE_STORE_TTL):
+        # from_url gives the client its own connection pool
+        self.client = redis.Redis.from_url(url, socket_connect_timeout=2, socket_timeout=2)
+        self.ttl = ttl
+    
+    def get(self, user_id):
+        """Return the stored profile for user_id, or None"""
+        raw = self.client.get(self.KEY_PREFIX + user_id)
+        return json.loads(raw) if raw else None
+    
+    def set(self, user_id, user_data):
+        """Store a profile for user_id, expiring after the store TTL"""
+        self.client.setex(self.KEY_PREFIX + user_id, self.ttl, json.dumps(user_data))
+
+def init_profile_store():
+    """Connect to Redis when REDIS_URL is set, otherwise keep profiles in memory"""
+    if not REDIS_URL:
+        return None
+    if redis is None:
+        logger.warning("REDIS_URL is set but the redis package is not installed - using in-memory profiles")
+        return None
+    try:
+        store = RedisProfileStore(REDIS_URL)
+        store.client.ping()
+        logger.debug("Redis profile store connected")
+        return store
+    except Exception as e:
+        logger.warning("Redis profile store unavailable, using in-memory profiles: %s", e)
+        return None
+
+profile_store = init_profile_store()
+
+def _load_profile(user_id):
+    """
+    Read a profile from the shared store, falling back to this process's memory
+    
+    Memory is checked on a Redis miss as well as on a Redis error, because
+    profiles whose Redis write failed were kept there instead.
+    """
+    if profile_store:
+        try:
+            user_data = profile_store.get(user_id)
+            if user_data is not None:
+                return user_data
+        except Exception as e:
+            logger.warning("Redis profile read failed: %s", e)
+    with _user_profiles_lock:
+        user_data = user_profiles.get(user_id)
+        if user_data is not None:
+            user_profiles.move_to_end(user_id)
+        return user_data
+
+def _store_profile(user_id, user_data):
+    """Write a profile to the shared store, falling back to this process's memory"""
+    if profile_store:
+        try:
+            profile_store.set(user_id, user_data)
+            # Drop any copy kept during an earlier Redis outage so it can't shadow this one
+            with _user_profiles_lock:
+                user_profiles.pop(user_id, None)
+            return
+        except Exception as e:
+            logger.warning("Redis profile write failed: %s", e)
+    with _user_profiles_lock:
+        user_profiles[user_id] = user_data
+        user_profiles.move_to_end(user_id)
+        if len(user_profiles) > MAX_USER_PROFILES:
+            user_profiles.popitem(last=False)
+
 class UserPreferenceManager:
     """💾 Manage user preferences and personalized recommendations"""
     
@@ -263,122 +381,138 @@ class UserPreferenceManager:
     def save_user_profile(user_id, profile_data, music_preferences):
         """Save user profile and music preferences"""
         # 🔧 FIX 1: Use consistent naming - 'preferences' not 'music_preferences'
-        user_profiles[user_id] = {
+        _store_profile(user_id, {
             'profile': profile_data,
             'preferences': music_preferences,  # ✅ Fixed: consistent naming
             'last_updated': datetime.now().isoformat(),
-            'song_suggestions_history': []  # Track what we've suggested
-        }
+            'song_suggestions_history': [],  # Track what we've suggested
+            # Profile-dependent parts of the personalized search terms, so each
+            # request only has to add the emotion
+            'search_parts': {
+                'genres': music_preferences.get('top_genres', [])[:5],
+                'artists': music_preferences.get('favorite_artists', [])[:3],
+                'artist_terms': [
+                    f"songs like {artist}"
+                    for artist in music_preferences.get('favorite_artists', [])[:3]
+                ]
+            }
+        })
         
-        print(f"💾 Saved profile for user {user_id}")
-        print(f"🎵 Top genres: {music_preferences.get('top_genres', [])[:3]}")
-        print(f"🎤 Favorite artists: {music_preferences.get('favorite_artists', [])[:3]}")
+        logger.debug("Saved profile for user %s", user_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Top genres: %s", music_preferences.get('top_genres', [])[:3])
+            logger.debug("Favorite artists: %s", music_preferences.get('favorite_artists', [])[:3])
         return True
     
     @staticmethod
     def get_user_profile(user_id):
         """Get user profile and preferences"""
-        user_data = user_profiles.get(user_id)
+        user_data = _load_profile(user_id)
         if user_data:
-            print(f"📊 Retrieved profile for {user_id}")
-            print(f"🎵 Genres available: {len(user_data.get('preferences', {}).get('top_genres', []))}")
-            print(f"🎤 Artists available: {len(user_data.get('preferences', {}).get('favorite_artists', []))}")
+            logger.debug("Retrieved profile for %s", user_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                preferences = user_data.get('preferences', {})
+                logger.debug("Genres available: %d", len(preferences.get('top_genres', [])))
+                logger.debug("Artists available: %d", len(preferences.get('favorite_artists', [])))
         else:
-            print(f"❌ No profile found for user {user_id}")
+            logger.debug("No profile found for user %s", user_id)
         return user_data
     
     @staticmethod
     def update_suggestion_history(user_id, suggested_song):
         """Track what songs we've suggested to this user"""
-        if user_id in user_profiles:
-            user_profiles[user_id]['song_suggestions_history'].append({
+        user_data = _load_profile(user_id)
+        if user_data:
+            history = user_data['song_suggestions_history']
+            history.append({
                 'song': suggested_song,
                 'timestamp': datetime.now().isoformat()
             })
+            # Plain list (not a deque) so the profile stays JSON-serialisable
+            if len(history) > MAX_SUGGESTION_HISTORY:
+                del history[:-MAX_SUGGESTION_HISTORY]
+            _store_profile(user_id, user_data)
     
     @staticmethod
     def get_personalized_search_terms(user_id, emotion_type):
         """🎯 Generate personalized search terms based on user preferences"""
-        user_data = user_profiles.get(user_id)
+        user_data = _load_profile(user_id)
         
         if not user_data:
-            print(f"❌ No user data found for personalized search: {user_id}")
+            logger.debug("No user data found for personalized search: %s", user_id)
             return None
         
         # 🔧 FIX 2: Use correct data structure key
         preferences = user_data.get('preferences', {})  # ✅ Fixed: was 'music_preferences'
         
         if not preferences:
-            print(f"❌ No preferences found for user {user_id}")
+            logger.debug("No preferences found for user %s", user_id)
             return None
         
-        # Base search terms from emotion
-        base_terms = []
+        search_parts = user_data['search_parts']
         
         # Add user's favorite genres
-        top_genres = preferences.get('top_genres', [])[:5]
-        print(f"🎭 User's top genres for {emotion_type}: {top_genres}")
-        
-        for genre in top_genres:
-            base_terms.append(f"{emotion_type} {genre}")
+        top_genres = search_parts['genres']
+        logger.debug("User's top genres for %s: %s", emotion_type, top_genres)
+        base_terms = [f"{emotion_type} {genre}" for genre in top_genres]
         
         # Add user's favorite artists
-        top_artists = preferences.get('favorite_artists', [])[:3]
-        print(f"🎤 User's top artists for {emotion_type}: {top_artists}")
-        
-        for artist in top_artists:
-            base_terms.append(f"songs like {artist}")
+        logger.debug("User's top artists for %s: %s", emotion_type, search_parts['artists'])
+        base_terms.extend(search_parts['artist_terms'])
         
         # Add genre-specific emotional terms
         if top_genres:
-            main_genre = top_genres[0] if top_genres else 'pop'
-            base_terms.append(f"{emotion_type} {main_genre} music")
+            base_terms.append(f"{emotion_type} {top_genres[0]} music")
         
-        print(f"🎯 Generated {len(base_terms)} personalized search terms: {base_terms}")
+        logger.debug("Generated %d personalized search terms: %s", len(base_terms), base_terms)
         return base_terms[:8]  # Return top 8 personalized search terms
 
-# 🎯 Initialize OAuth handler
-try:
-    spotify_auth = SpotifyUserAuth()
-    print("✅ Spotify auth handler initialized successfully")
-except Exception as e:
-    print(f"❌ Error initializing Spotify auth: {e}")
-    # Create a dummy handler so imports don't fail
-    spotify_auth = None
-
 def initialize_spotify_auth():
     """Initialize Spotify auth handler with error handling"""
     try:
         auth_handler = SpotifyUserAuth()
         if not auth_handler.client_id or not auth_handler.client_secret:
-            print("❌ Spotify credentials missing - auth disabled")
+            logger.warning("Spotify credentials missing - auth disabled")
             return None
-        print("✅ Spotify auth handler initialized successfully")
+        logger.debug("Spotify auth handler initialized successfully")
         return auth_handler
     except Exception as e:
-        print(f"❌ Error initializing Spotify auth: {e}")
+        logger.warning("Error initializing Spotify auth: %s", e)
         return None
 
+# 🎯 Initialize OAuth handler once on import
 spotify_auth = initialize_spotify_auth()
 
-# 🎯 Initialize OAuth handler
-spotify_auth = initialize_spotify_auth()
-
-def create_user_profile(access_token):
-    """🔍 Create complete user profile from Spotify data"""
+def create_user_profile(access_token, force_refresh=False):
+    """🔍 Create complete user profile from Spotify data
+    
+    A profile analyzed less than PROFILE_CACHE_TTL ago is reused instead of
+    re-running the analysis; pass force_refresh=True to always re-analyze.
+    """
     try:
         analyzer = UserProfileAnalyzer(access_token)
         
         # Get basic profile
         profile_data = analyzer.get_user_profile()
         if not profile_data:
-            print("❌ Failed to get profile data")
+            logger.warning("Failed to get profile data")
             return None
         
+        # Skip the analysis calls when this user's preferences are still fresh
+        if not force_refresh:
+            cached = _load_profile(profile_data['id'])
+            if cached and datetime.now() - datetime.fromisoformat(cached['last_updated']) < PROFILE_CACHE_TTL:
+                logger.debug("Reusing recent profile analysis for user %s", profile_data['id'])
+                return {
+                    'user_id': profile_data['id'],
+                    'profile': profile_data,
+                    'preferences': cached['preferences']
+                }
+        
         # Analyze music preferences
         music_preferences = analyzer.analyze_music_preferences()
         if not music_preferences:
-            print("❌ Failed to analyze music preferences")
+            logger.warning("Failed to analyze music preferences")
             return None
         
         # Save everything
@@ -393,7 +527,5 @@ def create_user_profile(access_token):
         }
         
     except Exception as e:
-        print(f"❌ Error creating user profile: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error creating user profile: %s", e)
         return None
\ No newline at end of file
@@ -9,14 +9,91 @@
 # Handles video search requests using YouTube Data API v3
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+import logging
+import tempfile
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from orjson import loads as json_loads  # Optional: faster JSON decoding
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    from .cache import MISSING, SQLiteTTLStore, TTLCache
+except ImportError:
+    from cache import MISSING, SQLiteTTLStore, TTLCache
+
+logger = logging.getLogger(__name__)
 
 # Initialize YouTube API configuration
 YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
 YOUTUBE_ENABLED = bool(YOUTUBE_API_KEY)
 
 if not YOUTUBE_ENABLED:
-    print("⚠️  YouTube API key not found")
+    logger.warning("YouTube API key not found")
+
+# YouTube Data API v3 search endpoint and the parameters shared by every search
+YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+YOUTUBE_SEARCH_PARAMS = {
+    'part': 'snippet',                # Request video metadata
+    'type': 'video',                  # Filter to video results only
+    'videoCategoryId': '10',          # Music category filter
+    'maxResults': 1,                  # Return single best result
+    # Partial response: only the fields read below come back
+    'fields': 'items(id/videoId,snippet(title,channelTitle,thumbnails/medium/url))',
+    'key': YOUTUBE_API_KEY            # API authentication
+}
+
+# Request timeouts in seconds: (connect, read)
+YOUTUBE_TIMEOUT = (3.05, 5)
+
+def _create_session():
+    """
+    Build a shared HTTP session so repeated searches reuse pooled keep-alive connections
+    
+    Returns:
+        requests.Session: Session with retrying, pooled HTTPS adapter mounted
+    """
+    session = requests.Session()
+    retry_policy = Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET'])
+    )
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry_policy))
+    session.headers.update({'Accept': 'application/json', 'User-Agent': 'YAIN/1.0'})
+    return session
+
+_session = _create_session()
+
+# Worker pool for batched searches; its width caps concurrent calls against the API quota
+YOUTUBE_WORKERS = 8
+_YOUTUBE_POOL = ThreadPoolExecutor(
+    max_workers=YOUTUBE_WORKERS,
+    thread_name_prefix='youtube'
+)
+atexit.register(_YOUTUBE_POOL.shutdown, wait=False, cancel_futures=True)
+
+# Search result cache keyed by normalized query; misses are cached for a
+# shorter time so a later upload can still be found
+YOUTUBE_CACHE_SIZE = 2048
+YOUTUBE_CACHE_TTL = 86400
+YOUTUBE_MISS_TTL = 3600
+search_cache = TTLCache(maxsize=YOUTUBE_CACHE_SIZE, ttl=YOUTUBE_CACHE_TTL)
+
+# Persistent second tier so cached searches survive restarts and are shared by workers
+YOUTUBE_CACHE_DIR = os.getenv('YOUTUBE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'yain-youtube'))
+search_disk_cache = SQLiteTTLStore(os.path.join(YOUTUBE_CACHE_DIR, 'search_cache.sqlite3'), max_entries=20000)
+
+def _cache_store(key, value, ttl):
+    """Write a search result to both the in-memory and persistent caches"""
+    search_cache.set(key, value, ttl)
+    search_disk_cache.set(key, value, ttl)
 
 def search_youtube_song(query):
     """
@@ -32,36 +109,73 @@ def search_youtube_song(query):
     if not YOUTUBE_ENABLED:
         return None
     
+    # Case and surrounding whitespace don't change the search, so share one entry
+    cache_key = query.strip().casefold()
+    cached = search_cache.get(cache_key, MISSING)
+    if cached is MISSING:
+        # Fall back to the persistent cache and warm memory for its remaining lifetime
+        cached, remaining_ttl = search_disk_cache.get(cache_key)
+        if cached is not MISSING:
+            search_cache.set(cache_key, cached, remaining_ttl)
+    if cached is not MISSING:
+        return dict(cached) if cached else None
+    
+    # Append search modifier to improve music video results
+    search_query = f"{query} official music video"
+    
+    # Only the query string varies between searches
+    params = {**YOUTUBE_SEARCH_PARAMS, 'q': search_query}
+    
+    # Execute API request; quota and other API errors surface as HTTPError
+    try:
+        response = _session.get(YOUTUBE_SEARCH_URL, params=params, timeout=YOUTUBE_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.warning("YouTube search request failed: %s", e)
+        return None
+    
+    # Parse response and extract video data
     try:
-        # Append search modifier to improve music video results
-        search_query = f"{query} official music video"
+        data = json_loads(response.content)
+        items = data.get('items')
+        if not items:
+            _cache_store(cache_key, None, YOUTUBE_MISS_TTL)
+            return None
         
-        # YouTube Data API v3 search endpoint
-        url = "https://www.googleapis.com/youtube/v3/search"
-        params = {
-            'part': 'snippet',                # Request video metadata
-            'q': search_query,                 # Search query string
-            'type': 'video',                   # Filter to video results only
-            'videoCategoryId': '10',           # Music category filter
-            'maxResults': 1,                   # Return single best result
-            'key': YOUTUBE_API_KEY             # API authentication
+        video = items[0]
+        snippet = video['snippet']
+        result = {
+            'title': snippet['title'],
+            'youtube_url': f"https://www.youtube.com/watch?v={video['id']['videoId']}",
+            'thumbnail_url': snippet['thumbnails']['medium']['url'],
+            'channel': snippet['channelTitle']
         }
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+        # ValueError covers JSON decode errors from both orjson and json
+        logger.warning("Unexpected YouTube search response: %r", e)
+        return None
+    
+    _cache_store(cache_key, result, YOUTUBE_CACHE_TTL)
+    return dict(result)
+
+def search_youtube_songs(queries):
+    """
+    Search YouTube for several music videos concurrently
+    
+    Args:
+        queries (list): Search terms, one per video
         
-        # Execute API request
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        # Parse response and extract video data
-        if 'items' in data and data['items']:
-            video = data['items'][0]
-            return {
-                'title': video['snippet']['title'],
-                'youtube_url': f"https://www.youtube.com/watch?v={video['id']['videoId']}",
-                'thumbnail_url': video['snippet']['thumbnails']['medium']['url'],
-                'channel': video['snippet']['channelTitle']
-            }
-            
-    except Exception as e:
-        print(f"YouTube search error: {e}")
+    Returns:
+        list: Video metadata dicts (or None for misses) in the same order as queries
+    """
+    if not YOUTUBE_ENABLED:
+        return [None] * len(queries)
     
-    return None
\ No newline at end of file
+    return list(_YOUTUBE_POOL.map(search_youtube_song, queries))
+
+# Module exports
+__all__ = [
+    'search_youtube_song',
+    'search_youtube_songs',
+    'YOUTUBE_ENABLED'
+]